@@ -1,22 +1,489 @@
 # -*- coding: utf-8 -*-
 
-import requests
+import importlib
 import json
 import re
+import os
+import time
+import random
+import gzip
+import zlib
+import hashlib
+import unicodedata
+import threading
+import codecs
+import csv
+import io
+import tempfile
+import zipfile
+from urllib.parse import quote
+import sys
+import math
+import functools
+import itertools
+import numbers
+import operator
 import statistics
-import pandas as pd
-import matplotlib.pyplot as plt
+from collections import Counter
+from collections.abc import Mapping
+
+class _ModuloDiferido:
+    """
+    Referencia a un módulo que solo se importa la primera vez que se accede a uno de sus atributos.
+    
+    requests, numpy y matplotlib.pyplot tardan en conjunto casi un segundo en importarse (matplotlib
+    además inicializa un backend gráfico). Con esta referencia, `from PIA_Modulo import ...` es casi
+    inmediato y cada dependencia se carga solo cuando una función la usa de verdad
+    (ej.: np.array(...) importa numpy en ese momento).
+    """
+    def __init__(self, nombre):
+        self._nombre = nombre
+        self._modulo = None
+    
+    def __getattr__(self, atributo):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nombre)
+        return getattr(self._modulo, atributo)
+    
+    def __repr__(self):
+        estado = "importado" if self._modulo is not None else "sin importar"
+        return f"<módulo diferido {self._nombre!r} ({estado})>"
+
+# Dependencias pesadas: se importan al primer uso (ver _ModuloDiferido)
+# asyncio es de la biblioteca estándar, pero solo lo usa el cliente asíncrono y su importación es costosa
+asyncio = _ModuloDiferido("asyncio")
+requests = _ModuloDiferido("requests")
+np = _ModuloDiferido("numpy")
+plt = _ModuloDiferido("matplotlib.pyplot")
+
+try:
+    # Serializador JSON rápido (opcional); si no está instalado se usa el módulo json estándar
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bloqueo de archivos: fcntl en sistemas POSIX, msvcrt en Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 
 """
 modulo.py - Funciones para interactuar con la API REST Countries (https://restcountries.com).
 Incluye métodos para obtener, estructurar y procesar datos geográficos y demográficos de países.
 """
-def obtener_datos_paises():
+# Endpoint base de REST Countries (versión 3.1)
+URL_BASE_API = "https://restcountries.com/v3.1"
+
+# Configuración por defecto de la caché HTTP en disco
+DIRECTORIO_CACHE = ".cache_restcountries"
+TTL_CACHE_SEGUNDOS = 3600
+
+def _ruta_cache(url, parametros=None, directorio_cache=DIRECTORIO_CACHE):
+    """
+    Construye la ruta del archivo de caché asociado a una URL y sus parámetros de consulta.
+    
+    La clave se obtiene con un hash SHA-256 de la URL y los parámetros ordenados, de modo que
+    la misma consulta siempre apunte al mismo archivo sin importar el orden de los parámetros.
+    
+    Args:
+        url (str): URL solicitada (ej.: "https://restcountries.com/v3.1/all").
+        parametros (dict): Parámetros de consulta enviados con la solicitud (opcional).
+        directorio_cache (str): Carpeta donde se almacenan las respuestas en caché.
+    
+    Returns:
+        str: Ruta del archivo JSON de caché.
+    """
+    clave = json.dumps([url, sorted((parametros or {}).items())], ensure_ascii=False)
+    return os.path.join(directorio_cache, hashlib.sha256(clave.encode("utf-8")).hexdigest() + ".json")
+
+def leer_cache(url, parametros=None, directorio_cache=DIRECTORIO_CACHE):
+    """
+    Lee una respuesta previamente almacenada en la caché en disco.
+    
+    Args:
+        url (str): URL de la solicitud original.
+        parametros (dict): Parámetros de consulta de la solicitud original (opcional).
+        directorio_cache (str): Carpeta donde se almacenan las respuestas en caché.
+    
+    Returns:
+        dict: Entrada de caché con las claves "cuerpo", "etag", "last_modified" y "guardado".
+        None: Si no existe una entrada o el archivo está dañado.
+    """
+    try:
+        with open(_ruta_cache(url, parametros, directorio_cache), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # Sin caché previa o archivo ilegible: se tratará como un fallo de caché
+        return None
+
+def guardar_cache(url, parametros, cuerpo, etag=None, last_modified=None, directorio_cache=DIRECTORIO_CACHE):
+    """
+    Almacena en disco el cuerpo de una respuesta junto con sus cabeceras de validación.
+    
+    Args:
+        url (str): URL de la solicitud.
+        parametros (dict): Parámetros de consulta de la solicitud (puede ser None).
+        cuerpo (list | dict): Contenido JSON ya decodificado de la respuesta.
+        etag (str): Valor de la cabecera ETag devuelta por el servidor (opcional).
+        last_modified (str): Valor de la cabecera Last-Modified devuelta por el servidor (opcional).
+        directorio_cache (str): Carpeta donde se almacenan las respuestas en caché.
+    
+    Returns:
+        None: Los errores de escritura se informan en consola sin interrumpir la ejecución.
+    """
+    entrada = {
+        "url": url,
+        "parametros": parametros or {},
+        "etag": etag,
+        "last_modified": last_modified,
+        "guardado": time.time(),
+        "cuerpo": cuerpo
+    }
+    try:
+        os.makedirs(directorio_cache, exist_ok=True)
+        # Escritura atómica: otro proceso nunca lee una entrada de caché a medio escribir
+        with ArchivoAtomico(_ruta_cache(url, parametros, directorio_cache), "w", bloquear=False) as f:
+            json.dump(entrada, f, ensure_ascii=False)
+    except OSError as e:
+        # La caché es una optimización: un fallo al escribirla no debe detener el programa
+        print(f"No se pudo guardar la caché: {e}")
+
+# Política de reintentos por defecto para solicitudes HTTP
+REINTENTOS_HTTP = 3
+FACTOR_ESPERA_SEGUNDOS = 0.5
+ESPERA_MAXIMA_SEGUNDOS = 30
+CODIGOS_REINTENTABLES = frozenset({429, 500, 502, 503, 504})
+
+_clase_circuito_abierto = None
+
+def _error_circuito_abierto():
+    # La excepción hereda de una clase de requests, así que se define al usarse por primera vez
+    # para no importar requests al cargar el módulo; se expone como PIA_Modulo.CircuitoAbiertoError
+    global _clase_circuito_abierto
+    if _clase_circuito_abierto is None:
+        class CircuitoAbiertoError(requests.exceptions.RequestException):
+            """Se lanza cuando el interruptor de circuito bloquea solicitudes a una API que está fallando."""
+        CircuitoAbiertoError.__module__ = __name__
+        _clase_circuito_abierto = CircuitoAbiertoError
+    return _clase_circuito_abierto
+
+def __getattr__(nombre):
+    # Atributos del módulo que se crean al pedirse (PEP 562), ej.: from PIA_Modulo import CircuitoAbiertoError
+    if nombre == "CircuitoAbiertoError":
+        return _error_circuito_abierto()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+class InterruptorCircuito:
+    """
+    Interruptor de circuito (circuit breaker) para dejar de consultar temporalmente una API inestable.
+    
+    Tras `umbral_fallos` fallos consecutivos el circuito se abre y las solicitudes se rechazan de
+    inmediato durante `tiempo_recuperacion` segundos. Pasado ese tiempo se permite una única
+    solicitud de prueba (estado semiabierto) y las demás se siguen rechazando mientras está en
+    curso: si tiene éxito el circuito se cierra, si falla vuelve a abrirse.
+    
+    Args:
+        umbral_fallos (int): Fallos consecutivos necesarios para abrir el circuito. Por defecto: 5.
+        tiempo_recuperacion (float): Segundos que el circuito permanece abierto. Por defecto: 60.
+    """
+    def __init__(self, umbral_fallos=5, tiempo_recuperacion=60):
+        self.umbral_fallos = umbral_fallos
+        self.tiempo_recuperacion = tiempo_recuperacion
+        self.fallos = 0
+        self.abierto_desde = None
+        self.sonda_en_curso = False
+        self._candado = threading.Lock()
+    
+    def permitir(self):
+        """
+        Devuelve True si la solicitud puede enviarse: circuito cerrado, o circuito abierto cuyo tiempo
+        de recuperación terminó y sin otra solicitud de prueba en curso (esta pasa a ser la prueba).
+        """
+        with self._candado:
+            if self.abierto_desde is None:
+                return True
+            if self.sonda_en_curso or time.monotonic() - self.abierto_desde < self.tiempo_recuperacion:
+                return False
+            self.sonda_en_curso = True
+            return True
+    
+    def registrar_exito(self):
+        """Cierra el circuito y reinicia el contador de fallos."""
+        with self._candado:
+            self.fallos = 0
+            self.abierto_desde = None
+            self.sonda_en_curso = False
+    
+    def registrar_fallo(self):
+        """Cuenta un fallo y abre (o reabre) el circuito al alcanzar el umbral o si falla la prueba."""
+        with self._candado:
+            self.fallos += 1
+            if self.fallos >= self.umbral_fallos or self.sonda_en_curso:
+                self.abierto_desde = time.monotonic()
+            self.sonda_en_curso = False
+    
+    def cancelar_sonda(self):
+        """Libera la prueba en curso sin cambiar el estado (la solicitud terminó sin éxito ni fallo atribuible a la API)."""
+        with self._candado:
+            self.sonda_en_curso = False
+
+# Interruptor compartido por todas las solicitudes a REST Countries
+INTERRUPTOR_API = InterruptorCircuito()
+
+_sesion_http = None
+
+def obtener_sesion_http(max_conexiones=10):
+    """
+    Devuelve la sesión HTTP compartida del módulo, creándola en la primera llamada.
+    
+    La sesión mantiene conexiones keep-alive reutilizables, evitando abrir una conexión TCP/TLS
+    nueva en cada solicitud como ocurre con requests.get.
+    
+    Args:
+        max_conexiones (int): Tamaño del conjunto de conexiones por host. Por defecto: 10.
+    
+    Returns:
+        requests.Session: Sesión compartida.
+    """
+    global _sesion_http
+    if _sesion_http is None:
+        _sesion_http = requests.Session()
+        adaptador = requests.adapters.HTTPAdapter(pool_connections=max_conexiones, pool_maxsize=max_conexiones)
+        _sesion_http.mount("https://", adaptador)
+        _sesion_http.mount("http://", adaptador)
+    return _sesion_http
+
+def _segundos_retry_after(valor):
+    """
+    Interpreta la cabecera Retry-After, que puede ser un número de segundos o una fecha HTTP.
+    
+    Returns:
+        float: Segundos a esperar, o None si la cabecera no existe o no es válida.
+    """
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    # Importación diferida: solo se necesita si el servidor envía Retry-After como fecha HTTP
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def solicitar_con_reintentos(url, parametros=None, cabeceras=None, timeout=10, reintentos=REINTENTOS_HTTP,
+                             factor_espera=FACTOR_ESPERA_SEGUNDOS, espera_maxima=ESPERA_MAXIMA_SEGUNDOS,
+                             interruptor=INTERRUPTOR_API, stream=False):
+    """
+    Realiza una solicitud GET con la sesión compartida, reintentos y protección de circuito.
+    
+    Ante códigos 429/5xx, tiempos de espera agotados o errores de conexión se reintenta con espera
+    exponencial con jitter (aleatoria entre 0 y factor_espera * 2^intento, limitada a espera_maxima).
+    Si el servidor envía Retry-After, se respeta ese valor en lugar del calculado.
+    
+    Args:
+        url (str): URL a consultar.
+        parametros (dict): Parámetros de consulta (opcional).
+        cabeceras (dict): Cabeceras HTTP adicionales (opcional).
+        timeout (float): Tiempo máximo por intento en segundos. Por defecto: 10.
+        reintentos (int): Reintentos adicionales tras el primer intento. Por defecto: 3.
+        factor_espera (float): Base en segundos de la espera exponencial. Por defecto: 0.5.
+        espera_maxima (float): Espera máxima entre intentos en segundos. Por defecto: 30.
+        interruptor (InterruptorCircuito): Interruptor a consultar y actualizar (None para desactivarlo).
+        stream (bool): Si es True, el cuerpo no se descarga de inmediato (ver iterar_datos_paises).
+    
+    Returns:
+        requests.Response: Respuesta final (puede tener código de error no reintentable, ej.: 404).
+    
+    Raises:
+        CircuitoAbiertoError: Si el circuito está abierto.
+        requests.exceptions.RequestException: Si se agotan los reintentos.
+    """
+    if interruptor and not interruptor.permitir():
+        raise _error_circuito_abierto()(f"Circuito abierto: se omite la solicitud a {url}")
+    
+    try:
+        sesion = obtener_sesion_http()
+        for intento in range(reintentos + 1):
+            espera = random.uniform(0, min(espera_maxima, factor_espera * 2 ** intento))
+            try:
+                respuesta = sesion.get(url, params=parametros, headers=cabeceras, timeout=timeout, stream=stream)
+                if respuesta.status_code not in CODIGOS_REINTENTABLES:
+                    if interruptor:
+                        interruptor.registrar_exito()
+                    return respuesta
+                # Retry-After (habitual en 429/503) tiene prioridad sobre la espera calculada
+                if (retry_after := _segundos_retry_after(respuesta.headers.get("Retry-After"))) is not None:
+                    espera = min(retry_after, espera_maxima)
+                # La respuesta descartada se cierra para devolver su conexión al pool (con stream=True
+                # el cuerpo no se ha leído y la conexión quedaría ocupada)
+                respuesta.close()
+                if intento == reintentos:
+                    respuesta.raise_for_status()
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError, requests.exceptions.HTTPError):
+                if intento == reintentos:
+                    if interruptor:
+                        interruptor.registrar_fallo()
+                    raise
+            time.sleep(espera)
+    except BaseException:
+        # Cualquier otra salida (ej.: URL inválida, interrupción) no debe dejar la prueba del circuito en curso
+        if interruptor:
+            interruptor.cancelar_sonda()
+        raise
+
+def solicitar_json_con_cache(url, parametros=None, usar_cache=True, ttl_cache=TTL_CACHE_SEGUNDOS,
+                             directorio_cache=DIRECTORIO_CACHE, timeout=10, reintentos=REINTENTOS_HTTP):
+    """
+    Realiza una solicitud GET que devuelve JSON apoyándose en una caché HTTP persistente.
+    
+    Si existe una respuesta guardada con antigüedad menor a `ttl_cache`, se devuelve directamente
+    desde disco sin tocar la red. Si la entrada está vencida, se envía una solicitud condicional
+    (If-None-Match / If-Modified-Since) para que el servidor responda 304 cuando los datos no
+    hayan cambiado, evitando descargar de nuevo el cuerpo completo.
+    
+    Las solicitudes usan solicitar_con_reintentos. Si aun así fallan (o el circuito está abierto)
+    y existe una copia en caché, se devuelve esa última copia aunque esté vencida.
+    
+    Args:
+        url (str): URL a consultar.
+        parametros (dict): Parámetros de consulta (opcional).
+        usar_cache (bool): Si es False, ignora la caché y siempre descarga la respuesta completa.
+        ttl_cache (float): Segundos durante los cuales la caché se considera vigente.
+        directorio_cache (str): Carpeta donde se almacenan las respuestas en caché.
+        timeout (float): Tiempo máximo de espera de cada intento en segundos.
+        reintentos (int): Reintentos ante errores transitorios. Por defecto: 3.
+    
+    Returns:
+        list | dict: Contenido JSON de la respuesta.
+    
+    Raises:
+        requests.exceptions.RequestException: Si la solicitud falla y no hay copia en caché.
+    """
+    entrada = leer_cache(url, parametros, directorio_cache) if usar_cache else None
+    
+    # Caché vigente: no es necesario consultar la API
+    if entrada and time.time() - entrada.get("guardado", 0) < ttl_cache:
+        return entrada["cuerpo"]
+    
+    # Caché vencida: revalidar con cabeceras condicionales
+    cabeceras = {}
+    if entrada:
+        if entrada.get("etag"):
+            cabeceras["If-None-Match"] = entrada["etag"]
+        if entrada.get("last_modified"):
+            cabeceras["If-Modified-Since"] = entrada["last_modified"]
+    
+    try:
+        respuesta = solicitar_con_reintentos(url, parametros, cabeceras, timeout=timeout, reintentos=reintentos)
+        if respuesta.status_code != 304:
+            respuesta.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        if not entrada:
+            raise
+        # Degradación controlada: se usa la última copia guardada en lugar de abortar la ejecución
+        print(f"Error al conectar con la API ({e}); usando la última copia en caché.")
+        return entrada["cuerpo"]
+    
+    if respuesta.status_code == 304 and entrada:
+        # Datos sin cambios: renovar la marca de tiempo y reutilizar el cuerpo guardado
+        guardar_cache(url, parametros, entrada["cuerpo"],
+                      respuesta.headers.get("ETag", entrada.get("etag")),
+                      respuesta.headers.get("Last-Modified", entrada.get("last_modified")),
+                      directorio_cache)
+        return entrada["cuerpo"]
+    
+    cuerpo = respuesta.json()
+    if usar_cache:
+        guardar_cache(url, parametros, cuerpo, respuesta.headers.get("ETag"),
+                      respuesta.headers.get("Last-Modified"), directorio_cache)
+    return cuerpo
+
+def _extraer_nombre(pais):
+    # Extraer nombre común del país desde el campo anidado "name"
+    return pais["name"]["common"]
+
+def normalizar_texto(texto):
+    """
+    Normaliza un texto para búsquedas: descompone (Unicode NFKD), elimina diacríticos y pliega mayúsculas.
+    
+    Args:
+        texto (str): Texto original (ej.: "México", "Perú", "Åland Islands").
+    
+    Returns:
+        str: Texto normalizado (ej.: "mexico", "peru", "aland islands").
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+def _extraer_nombre_normalizado(pais):
+    # Nombre común sin tildes ni mayúsculas, calculado una sola vez para las búsquedas normalizadas
+    return normalizar_texto(pais["name"]["common"])
+
+def _extraer_idiomas(pais):
+    # Procesar idiomas: obtener valores del diccionario y unirlos en una cadena
+    # Ejemplo: {"spa": "Spanish"} -> "Español"
+    return ", ".join(pais.get("languages", {}).values()) or "N/A"
+
+def _extraer_monedas(pais):
+    # Procesar monedas: iterar sobre el diccionario de monedas y formatearlas
+    # Ejemplo: {"COP": {"name": "Colombian peso"}} -> "COP (Colombian peso)"
+    return ", ".join(
+        [f"{code} ({info['name']})" for code, info in pais.get("currencies", {}).items()]
+    ) or "N/A"
+
+def _extraer_densidad(pais):
+    # Calcular densidad poblacional (habitantes por km²)
+    # Si el área es 0 (ej.: datos faltantes), la densidad se establece en 0
+    return calcular_densidad(pais.get("population", 0), pais.get("area", 0))
+
+# Esquema de los datos estructurados: (columna de salida, campos crudos de la API que consume, extractor).
+# estructurar_datos_paises construye cada fila a partir de este esquema y obtener_datos_paises
+# deriva de él la proyección ?fields=, por lo que ambos no pueden desincronizarse.
+ESQUEMA_PAISES = (
+    ("Nombre", ("name",), _extraer_nombre),
+    ("Población", ("population",), lambda pais: pais.get("population", 0)),  # 0 si no está disponible
+    ("Área (km²)", ("area",), lambda pais: pais.get("area", 0)),  # 0 si no está disponible
+    ("Densidad (hab/km²)", ("population", "area"), _extraer_densidad),
+    ("Región", ("region",), lambda pais: pais.get("region", "N/A")),
+    ("Subregión", ("subregion",), lambda pais: pais.get("subregion", "N/A")),
+    ("Idiomas", ("languages",), _extraer_idiomas),
+    ("Monedas", ("currencies",), _extraer_monedas),
+    ("Nombre Normalizado", ("name",), _extraer_nombre_normalizado),
+)
+
+# Campos crudos de la API que realmente usa la estructuración (sin duplicados, en orden de aparición)
+CAMPOS_API_ESTRUCTURA = tuple(dict.fromkeys(campo for _, campos, _ in ESQUEMA_PAISES for campo in campos))
+
+# Campos crudos adicionales para construir la tabla de alias de búsqueda (ver construir_tabla_alias)
+CAMPOS_API_BUSQUEDA = ("translations", "altSpellings")
+
+def obtener_datos_paises(campos=CAMPOS_API_ESTRUCTURA, usar_cache=True, ttl_cache=TTL_CACHE_SEGUNDOS,
+                         directorio_cache=DIRECTORIO_CACHE):
     """
     Obtiene datos de todos los países desde la API REST Countries.
     
     Realiza una solicitud HTTP GET al endpoint oficial de REST Countries y devuelve 
     información como nombre, población, área, idiomas, monedas, entre otros.
+    Las respuestas se guardan en una caché en disco: dentro de `ttl_cache` se sirven sin
+    acceder a la red y, pasado ese tiempo, se revalidan con ETag/Last-Modified.
+    
+    Por defecto solo se solicitan (parámetro `?fields=`) los campos que consume
+    estructurar_datos_paises, lo que reduce el tamaño de la respuesta y el tiempo de decodificación.
+    
+    Args:
+        campos (iterable): Campos de la API a solicitar. Por defecto: CAMPOS_API_ESTRUCTURA.
+                           Use None para descargar todos los campos.
+        usar_cache (bool): Si es False, siempre descarga los datos completos. Por defecto: True.
+        ttl_cache (float): Segundos de vigencia de la caché. Por defecto: 3600.
+        directorio_cache (str): Carpeta de la caché. Por defecto: ".cache_restcountries".
     
     Returns:
         list: Lista de diccionarios con datos de cada país (ej.: [{"nombre": "Colombia", "población": 50_882_891, ...}]). 
@@ -35,21 +502,274 @@ def obtener_datos_paises():
         }
     """
     # Endpoint oficial de REST Countries para obtener datos de todos los países
-    url = "https://restcountries.com/v3.1/all"
+    url = f"{URL_BASE_API}/all"
+    
+    # Proyección de campos: la API devuelve únicamente los campos listados en ?fields=
+    parametros = {"fields": ",".join(campos)} if campos else None
     
     try:
-        # Uso de expresión nombrada para simplificar la asignación y la condición
-        if (respuesta := requests.get(url, timeout=10)).status_code == 200:
-            return respuesta.json()
-        respuesta.raise_for_status()
+        return solicitar_json_con_cache(url, parametros, usar_cache=usar_cache, ttl_cache=ttl_cache,
+                                        directorio_cache=directorio_cache)
     except requests.exceptions.RequestException as e:
         print(f"Error al conectar con la API: {e}")
         return None
 
+"""
+modulo.py - Lectura incremental (streaming) de arreglos JSON grandes, elemento por elemento.
+"""
+TAMANO_FRAGMENTO_BYTES = 64 * 1024
+
+def iterar_arreglo_json(fragmentos):
+    """
+    Decodifica de forma incremental un arreglo JSON de nivel superior y entrega sus elementos uno a uno.
+    
+    Solo se mantiene en memoria el texto pendiente de decodificar (aproximadamente un elemento),
+    por lo que el consumo de memoria no depende del tamaño total del arreglo.
+    
+    Args:
+        fragmentos (iterable): Fragmentos de texto (str) que, concatenados, forman el documento JSON.
+    
+    Yields:
+        object: Cada elemento del arreglo (ej.: el diccionario crudo de un país).
+    
+    Raises:
+        json.JSONDecodeError: Si el documento no es un arreglo JSON válido (incluye el texto truncado y el
+                              contenido sobrante tras el ']' final). Los elementos anteriores al error
+                              ya se habrán entregado.
+    
+    Ejemplo de uso:
+        for pais in iterar_arreglo_json(['[{"name": {"common": "Per', 'u"}}]']):
+            print(pais["name"]["common"])
+    """
+    decodificador = json.JSONDecoder()
+    fragmentos = iter(fragmentos)
+    buffer, pos, agotado = "", 0, False
+    
+    def leer_mas():
+        # Añade el siguiente fragmento al buffer descartando lo ya consumido
+        nonlocal buffer, pos, agotado
+        fragmento = next(fragmentos, None)
+        if fragmento is None:
+            agotado = True
+            return False
+        buffer = buffer[pos:] + fragmento
+        pos = 0
+        return True
+    
+    def siguiente_caracter():
+        # Devuelve el siguiente carácter significativo (sin espacios) o "" al final del documento
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not leer_mas():
+                return ""
+    
+    def terminar():
+        # Tras el ']' final solo pueden quedar espacios
+        nonlocal pos
+        pos += 1
+        if siguiente_caracter():
+            raise json.JSONDecodeError("Contenido adicional tras el arreglo JSON", buffer, pos)
+    
+    if siguiente_caracter() != "[":
+        raise json.JSONDecodeError("Se esperaba un arreglo JSON", buffer, pos)
+    pos += 1
+    
+    if siguiente_caracter() == "]":
+        terminar()
+        return
+    
+    while True:
+        siguiente_caracter()
+        # Decodificar el siguiente elemento; si el buffer lo contiene incompleto, leer más texto.
+        # Un número puede decodificarse parcialmente (ej.: "4.5" de "4.5e3" partido entre fragmentos),
+        # así que solo se acepta si le sigue un delimitador o ya no hay más datos.
+        while True:
+            try:
+                elemento, fin = decodificador.raw_decode(buffer, pos)
+                if agotado or (fin < len(buffer) and (buffer[fin].isspace() or buffer[fin] in ",]")):
+                    break
+            except json.JSONDecodeError:
+                if agotado:
+                    raise
+            leer_mas()
+        pos = fin
+        yield elemento
+        
+        separador = siguiente_caracter()
+        if separador == "]":
+            terminar()
+            return
+        if separador != ",":
+            raise json.JSONDecodeError("Se esperaba ',' o ']'", buffer, pos)
+        pos += 1
+
+def _decodificar_fragmentos(fragmentos_bytes, codificacion="utf-8"):
+    # Decodificación incremental: un carácter multibyte puede quedar partido entre dos fragmentos
+    decodificador = codecs.getincrementaldecoder(codificacion)()
+    for fragmento in fragmentos_bytes:
+        yield decodificador.decode(fragmento)
+    yield decodificador.decode(b"", final=True)
+
+def iterar_paises_desde_archivo(nombre_archivo, tamano_fragmento=TAMANO_FRAGMENTO_BYTES):
+    """
+    Lee en streaming un archivo JSON con un arreglo de países (crudos o estructurados).
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo JSON (ej.: un volcado espejo de /v3.1/all).
+        tamano_fragmento (int): Caracteres leídos por fragmento. Por defecto: 64 KiB.
+    
+    Yields:
+        dict: Cada país del arreglo, en el orden del archivo.
+    """
+    with open(nombre_archivo, "r", encoding="utf-8") as f:
+        yield from iterar_arreglo_json(iter(lambda: f.read(tamano_fragmento), ""))
+
+def iterar_datos_paises(campos=CAMPOS_API_ESTRUCTURA, timeout=10, tamano_fragmento=TAMANO_FRAGMENTO_BYTES):
+    """
+    Variante en streaming de obtener_datos_paises: entrega cada país crudo a medida que llega por la red.
+    
+    A diferencia de obtener_datos_paises, no materializa la respuesta completa ni usa la caché,
+    lo que permite empezar a estructurar, filtrar o exportar antes de terminar la descarga.
+    
+    Args:
+        campos (iterable): Campos de la API a solicitar. Por defecto: CAMPOS_API_ESTRUCTURA.
+        timeout (float): Tiempo máximo de espera de la conexión en segundos. Por defecto: 10.
+        tamano_fragmento (int): Bytes leídos del socket por fragmento. Por defecto: 64 KiB.
+    
+    Yields:
+        dict: Datos crudos de cada país. Si la conexión falla, se informa en consola y la iteración termina.
+    
+    Ejemplo de uso:
+        for pais in iterar_datos_paises():
+            print(pais["name"]["common"])
+    """
+    url = f"{URL_BASE_API}/all"
+    parametros = {"fields": ",".join(campos)} if campos else None
+    
+    try:
+        with solicitar_con_reintentos(url, parametros, timeout=timeout, stream=True) as respuesta:
+            respuesta.raise_for_status()
+            yield from iterar_arreglo_json(
+                _decodificar_fragmentos(respuesta.iter_content(tamano_fragmento), respuesta.encoding or "utf-8")
+            )
+    except requests.exceptions.RequestException as e:
+        print(f"Error al conectar con la API: {e}")
+
+"""
+modulo.py - Cliente asíncrono para consultas dirigidas a endpoints de REST Countries usando aiohttp.
+"""
+# Endpoints dirigidos admitidos por el cliente asíncrono (tipo de consulta -> ruta)
+ENDPOINTS_DIRIGIDOS = {
+    "region": "region",      # /region/{region}
+    "alpha": "alpha",        # /alpha?codes=col,mex
+    "lang": "lang",          # /lang/{codigo}
+    "currency": "currency",  # /currency/{codigo}
+}
+
+def _preparar_consulta(consulta, campos):
+    """
+    Traduce una consulta (tipo, valor) a la URL y los parámetros de la API.
+    
+    Args:
+        consulta (tuple): Par (tipo, valor), ej.: ("region", "europe"), ("alpha", ("col", "mex")).
+        campos (iterable): Campos a solicitar con ?fields= (None para todos).
+    
+    Returns:
+        tuple: (url, parametros) listos para la solicitud HTTP.
+    
+    Raises:
+        ValueError: Si el tipo de consulta no está en ENDPOINTS_DIRIGIDOS.
+    """
+    tipo, valor = consulta
+    if tipo not in ENDPOINTS_DIRIGIDOS:
+        raise ValueError(f"Tipo de consulta no soportado: {tipo!r}. Use uno de {sorted(ENDPOINTS_DIRIGIDOS)}.")
+    
+    parametros = {"fields": ",".join(campos)} if campos else {}
+    if tipo == "alpha":
+        # /alpha acepta varios códigos ISO en una sola solicitud mediante ?codes=
+        codigos = [valor] if isinstance(valor, str) else list(valor)
+        parametros["codes"] = ",".join(codigos)
+        return f"{URL_BASE_API}/alpha", parametros
+    return f"{URL_BASE_API}/{ENDPOINTS_DIRIGIDOS[tipo]}/{quote(str(valor))}", parametros
+
+async def consultar_endpoints_async(consultas, campos=CAMPOS_API_ESTRUCTURA, max_concurrentes=10, timeout=10):
+    """
+    Consulta concurrentemente varios endpoints dirigidos y entrega cada resultado en cuanto termina.
+    
+    Todas las solicitudes comparten una sesión aiohttp (y su conjunto de conexiones keep-alive);
+    un semáforo limita cuántas están en vuelo a la vez y cada una tiene su propio tiempo máximo.
+    
+    Args:
+        consultas (iterable): Pares (tipo, valor) con tipo en "region", "alpha", "lang" o "currency".
+                              Ej.: [("region", "europe"), ("alpha", ("col", "mex")), ("lang", "spa")].
+        campos (iterable): Campos a solicitar con ?fields=. Por defecto: CAMPOS_API_ESTRUCTURA.
+        max_concurrentes (int): Número máximo de solicitudes simultáneas. Por defecto: 10.
+        timeout (float): Tiempo máximo por solicitud en segundos. Por defecto: 10.
+    
+    Yields:
+        tuple: (consulta, datos) en orden de finalización. `datos` es la lista de países devuelta
+               por la API o None si la solicitud falló (el error se informa en consola).
+    
+    Ejemplo de uso:
+        async for consulta, datos in consultar_endpoints_async([("region", "europe"), ("lang", "spa")]):
+            print(consulta, len(datos or []))
+    """
+    # Importación diferida: aiohttp solo se necesita cuando se usa el cliente asíncrono
+    import aiohttp
+    
+    semaforo = asyncio.Semaphore(max_concurrentes)
+    conector = aiohttp.TCPConnector(limit=max_concurrentes)
+    
+    async with aiohttp.ClientSession(connector=conector) as sesion:
+        async def consultar(consulta):
+            url, parametros = _preparar_consulta(consulta, campos)
+            async with semaforo:
+                try:
+                    async with sesion.get(url, params=parametros,
+                                          timeout=aiohttp.ClientTimeout(total=timeout)) as respuesta:
+                        respuesta.raise_for_status()
+                        return consulta, await respuesta.json()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    print(f"Error al consultar {url}: {e}")
+                    return consulta, None
+        
+        # as_completed entrega las tareas en orden de finalización, no en orden de envío
+        for tarea in asyncio.as_completed([consultar(consulta) for consulta in consultas]):
+            yield await tarea
+
+def consultar_endpoints(consultas, campos=CAMPOS_API_ESTRUCTURA, max_concurrentes=10, timeout=10):
+    """
+    Versión síncrona de consultar_endpoints_async para usar desde código no asíncrono.
+    
+    Args:
+        consultas (iterable): Pares (tipo, valor), ver consultar_endpoints_async.
+        campos (iterable): Campos a solicitar con ?fields=. Por defecto: CAMPOS_API_ESTRUCTURA.
+        max_concurrentes (int): Número máximo de solicitudes simultáneas. Por defecto: 10.
+        timeout (float): Tiempo máximo por solicitud en segundos. Por defecto: 10.
+    
+    Returns:
+        dict: Resultado por consulta (ej.: {("region", "europe"): [...], ("lang", "xyz"): None}).
+              Los valores de lista en las consultas "alpha" se convierten a tuplas para usarse como clave.
+    
+    Ejemplo de uso:
+        resultados = consultar_endpoints([("currency", "cop"), ("alpha", ("col", "mex"))])
+    """
+    consultas = [(tipo, tuple(valor) if isinstance(valor, list) else valor) for tipo, valor in consultas]
+    
+    async def recolectar():
+        return {consulta: datos async for consulta, datos in
+                consultar_endpoints_async(consultas, campos, max_concurrentes, timeout)}
+    
+    return asyncio.run(recolectar())
+
 """
 modulo.py - Funciones para estructurar y transformar datos de países obtenidos desde la API REST Countries.
 """
-def estructurar_datos_paises(datos):
+def estructurar_datos_paises(datos, columnar=False):
     """
     Convierte datos crudos de países en una lista de diccionarios con campos clave y normalizados.
     
@@ -60,6 +780,7 @@ def estructurar_datos_paises(datos):
     Args:
         datos (list): Lista de diccionarios obtenida desde la API REST Countries. 
                       Cada diccionario representa un país con todos sus datos crudos.
+        columnar (bool): Si es True, devuelve una TablaPaises (columnas NumPy) en lugar de una lista.
     
     Returns:
         list: Lista de diccionarios con los siguientes campos para cada país:
@@ -71,142 +792,1922 @@ def estructurar_datos_paises(datos):
             - Subregión: Subdivisión de la región (ej.: "Sudamérica").
             - Idiomas: Idiomas oficiales separados por comas (ej.: "Español, Inglés").
             - Monedas: Monedas oficiales con su nombre completo (ej.: "COP (Peso colombiano)").
+            - Nombre Normalizado: Nombre sin tildes y en minúsculas (ej.: "colombia"), para búsquedas.
     """
-    paises_estructurados = []
+    if columnar:
+        # La densidad no se calcula fila por fila: se obtiene después para toda la tabla de una vez
+        campos = tuple(columna for columna, _, _ in ESQUEMA_PAISES)
+        sin_densidad = tuple(campo for campo in campos if campo != "Densidad (hab/km²)")
+        tabla = TablaPaises.desde_filas(iterar_paises_estructurados(datos, sin_densidad), sin_densidad)
+        tabla.agregar_columna(
+            "Densidad (hab/km²)",
+            calcular_densidades(tabla.columna("Población"), tabla.columna("Área (km²)")),
+            campos.index("Densidad (hab/km²)")
+        )
+        return tabla
+    
+    # Materializar la versión perezosa en una lista (ver iterar_paises_estructurados)
+    return list(iterar_paises_estructurados(datos))
+
+def iterar_paises_estructurados(datos, campos=None):
+    """
+    Versión perezosa de estructurar_datos_paises: produce cada país estructurado bajo demanda.
     
+    Acepta cualquier iterable de países crudos (una lista, iterar_datos_paises() o
+    iterar_paises_desde_archivo()), por lo que puede encadenarse con las etapas de
+    pipeline sin construir listas intermedias.
+    
+    Args:
+        datos (iterable): Países crudos de la API REST Countries.
+        campos (iterable): Columnas de ESQUEMA_PAISES a calcular. Por defecto: todas.
+    
+    Yields:
+        dict: País estructurado con los campos de ESQUEMA_PAISES.
+    """
+    if campos is None:
+        esquema = ESQUEMA_PAISES
+    else:
+        campos = set(campos)
+        esquema = tuple(definicion for definicion in ESQUEMA_PAISES if definicion[0] in campos)
     for pais in datos:
         try:
-            # Extraer nombre común del país desde el campo anidado "name"
-            nombre = pais["name"]["common"]
-            
-            # Usar .get() para evitar KeyError si el campo no existe
-            poblacion = pais.get("population", 0)  # Población, 0 si no está disponible
-            area = pais.get("area", 0)  # Área en km², 0 si no está disponible
-            
-            # Región y subregión con valor por defecto "N/A" si no están presentes
-            region = pais.get("region", "N/A")
-            subregion = pais.get("subregion", "N/A")
-            
-            # Procesar idiomas: obtener valores del diccionario y unirlos en una cadena
-            # Ejemplo: {"spa": "Spanish"} -> "Español"
-            idiomas = ", ".join(pais.get("languages", {}).values()) or "N/A"
-            
-            # Procesar monedas: iterar sobre el diccionario de monedas y formatearlas
-            # Ejemplo: {"COP": {"name": "Colombian peso"}} -> "COP (Colombian peso)"
-            monedas = ", ".join(
-                [f"{code} ({info['name']})" for code, info in pais.get("currencies", {}).items()]
-            ) or "N/A"
-            
-            # Calcular densidad poblacional (habitantes por km²)
-            # Si el área es 0 (ej.: datos faltantes), la densidad se establece en 0
-            densidad = calcular_densidad(poblacion, area)
-            
-            # Añadir el país procesado a la lista estructurada
-            paises_estructurados.append({
-                "Nombre": nombre,
-                "Población": poblacion,
-                "Área (km²)": area,
-                "Densidad (hab/km²)": densidad,
-                "Región": region,
-                "Subregión": subregion,
-                "Idiomas": idiomas,
-                "Monedas": monedas
-            })
+            # Construir la fila aplicando cada extractor del esquema (ver ESQUEMA_PAISES)
+            yield _estructurar_pais(pais, esquema)
         
         except Exception as e:
             # Registrar errores específicos de procesamiento sin detener la ejecución
             print(f"Error procesando país: {e}")
+
+def _estructurar_pais(pais, esquema=ESQUEMA_PAISES):
+    """
+    Convierte un único país crudo en un diccionario con las columnas de ESQUEMA_PAISES.
+    
+    Args:
+        pais (dict): Datos crudos de un país devueltos por la API.
+        esquema (tuple): Subconjunto de ESQUEMA_PAISES a aplicar. Por defecto: el esquema completo.
+    
+    Returns:
+        dict: País estructurado (ej.: {"Nombre": "Colombia", "Población": 50882891, ...}).
+    
+    Raises:
+        KeyError: Si falta el nombre común del país.
+    """
+    return {columna: extraer(pais) for columna, _, extraer in esquema}
+
+def calcular_densidad(poblacion, area):
+    """
+    Calcula la densidad poblacional de un país (habitantes por km²).
+    
+    Evita divisiones por cero y redondea el resultado a 2 decimales.
+    
+    Args:
+        poblacion (int): Población total del país.
+        area (float): Área territorial del país en km².
+    
+    Returns:
+        float: Densidad poblacional calculada o 0 si el área es inválida (<= 0).
+    """
+    try:
+        # Calcular densidad y redondear para mejorar legibilidad
+        return round(poblacion / area, 2) if area > 0 else 0
+    except ZeroDivisionError:
+        # Manejar explícitamente división por cero (aunque ya está cubierto por el condicional)
+        return 0
+
+"""
+modulo.py - Tabla columnar de países respaldada por arreglos NumPy.
+"""
+# Tipos de las columnas numéricas y columnas de baja cardinalidad que se codifican como categorías
+# (los tipos se indican por nombre para no importar numpy al cargar el módulo)
+TIPOS_COLUMNAS_NUMERICAS = {
+    "Población": "int64",
+    "Área (km²)": "float64",
+    "Densidad (hab/km²)": "float64",
+}
+COLUMNAS_CATEGORICAS = ("Región", "Subregión")
+
+class FilaPais(Mapping):
+    """
+    Vista de solo lectura de una fila de TablaPaises que se comporta como el diccionario de un país.
+    
+    Permite seguir usando pais["Nombre"], pais.get("Población", 0), dict(pais), etc., sin copiar
+    los datos de las columnas.
+    """
+    __slots__ = ("_tabla", "_indice")
+    
+    def __init__(self, tabla, indice):
+        self._tabla = tabla
+        self._indice = indice
+    
+    def __getitem__(self, campo):
+        return self._tabla.valor(campo, self._indice)
+    
+    def __iter__(self):
+        return iter(self._tabla.campos)
+    
+    def __len__(self):
+        return len(self._tabla.campos)
+    
+    def __repr__(self):
+        return repr(dict(self))
+
+class TablaPaises:
+    """
+    Tabla columnar de países estructurados.
+    
+    Las columnas numéricas se guardan como arreglos NumPy int64/float64, "Región" y "Subregión"
+    como códigos enteros más un arreglo de categorías, y el resto del texto como arreglos de
+    cadenas internadas. Iterar la tabla o indexarla con un entero devuelve vistas FilaPais, de modo
+    que el código escrito para listas de diccionarios sigue funcionando.
+    
+    Args:
+        columnas (dict): Nombre de columna -> arreglo NumPy (códigos para columnas categóricas).
+        categorias (dict): Nombre de columna categórica -> arreglo con los valores de cada código.
+        campos (tuple): Orden de las columnas.
+    
+    Ejemplo de uso:
+        tabla = estructurar_datos_paises(datos_crudos, columnar=True)
+        tabla.columna("Población").sum()
+        tabla[0]["Nombre"]
+    """
+    def __init__(self, columnas, categorias, campos):
+        self._columnas = columnas
+        self._categorias = categorias
+        self.campos = tuple(campos)
+    
+    @classmethod
+    def desde_filas(cls, filas, campos=None):
+        """
+        Construye una tabla a partir de un iterable de diccionarios con las columnas de ESQUEMA_PAISES.
+        
+        Args:
+            filas (iterable): Países estructurados (lista o iterador).
+            campos (iterable): Columnas a incluir. Por defecto: todas las de ESQUEMA_PAISES.
+        
+        Returns:
+            TablaPaises: Tabla con una fila por país.
+        """
+        campos = tuple(campos or (columna for columna, _, _ in ESQUEMA_PAISES))
+        valores = {campo: [] for campo in campos}
+        for fila in filas:
+            for campo in campos:
+                valores[campo].append(fila[campo])
+        
+        columnas, categorias = {}, {}
+        for campo in campos:
+            if campo in TIPOS_COLUMNAS_NUMERICAS:
+                columnas[campo] = np.array(valores[campo], dtype=TIPOS_COLUMNAS_NUMERICAS[campo])
+            elif campo in COLUMNAS_CATEGORICAS:
+                # Codificación por diccionario: cada valor distinto se guarda una sola vez
+                categorias[campo], codigos = np.unique(np.array(valores[campo], dtype=object), return_inverse=True)
+                columnas[campo] = codigos.astype(np.int32)
+            else:
+                columnas[campo] = np.array([sys.intern(valor) for valor in valores[campo]], dtype=object)
+        return cls(columnas, categorias, campos)
+    
+    def __len__(self):
+        return len(self._columnas[self.campos[0]]) if self.campos else 0
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return self.seleccionar(np.arange(len(self))[indice])
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de fila fuera de rango")
+        return FilaPais(self, indice)
+    
+    def __iter__(self):
+        return (FilaPais(self, indice) for indice in range(len(self)))
+    
+    def __repr__(self):
+        return f"TablaPaises({len(self)} filas, columnas={list(self.campos)})"
+    
+    def valor(self, campo, indice):
+        """Devuelve el valor de una celda como escalar de Python (int, float o str)."""
+        if campo in self._categorias:
+            return self._categorias[campo][self._columnas[campo][indice]]
+        valor = self._columnas[campo][indice]
+        return valor.item() if isinstance(valor, np.generic) else valor
+    
+    def columna(self, campo):
+        """
+        Devuelve una columna completa como arreglo NumPy (decodificando las columnas categóricas).
+        
+        Raises:
+            KeyError: Si la columna no existe.
+        """
+        if campo in self._categorias:
+            return self._categorias[campo][self._columnas[campo]]
+        return self._columnas[campo]
+    
+    def codigos(self, campo):
+        """
+        Devuelve (códigos, categorías) de una columna categórica sin decodificarla.
+        
+        Raises:
+            KeyError: Si la columna no es categórica.
+        """
+        return self._columnas[campo], self._categorias[campo]
+    
+    def agregar_columna(self, campo, valores, posicion=None):
+        """
+        Añade (o reemplaza) una columna calculada, ej.: métricas de calcular_metricas_densidad.
+        
+        Args:
+            campo (str): Nombre de la columna.
+            valores (array-like): Un valor por fila.
+            posicion (int): Posición de la columna en `campos`. Por defecto: al final.
+        
+        Raises:
+            ValueError: Si la cantidad de valores no coincide con el número de filas.
+        """
+        valores = np.asarray(valores)
+        if len(valores) != len(self) and self.campos:
+            raise ValueError(f"La columna '{campo}' tiene {len(valores)} valores; se esperaban {len(self)}.")
+        campos = [c for c in self.campos if c != campo]
+        campos.insert(len(campos) if posicion is None else posicion, campo)
+        self._columnas[campo] = valores
+        self.campos = tuple(campos)
+    
+    def seleccionar(self, filas):
+        """
+        Devuelve una nueva tabla con las filas indicadas por una máscara booleana o un arreglo de índices.
+        """
+        return TablaPaises({campo: columna[filas] for campo, columna in self._columnas.items()},
+                           self._categorias, self.campos)
+    
+    def a_filas(self):
+        """Convierte la tabla en la lista de diccionarios que usa el resto del módulo."""
+        return [dict(fila) for fila in self]
+    
+    def a_columnas(self):
+        """Devuelve un diccionario columna -> arreglo decodificado (útil para pandas.DataFrame)."""
+        return {campo: self.columna(campo) for campo in self.campos}
+
+"""
+modulo.py - Etapas de pipeline perezoso y sumideros para procesar países en una sola pasada.
+"""
+def filtrar_filas(filas, predicado):
+    """
+    Etapa de pipeline que deja pasar solo las filas que cumplen un predicado.
+    
+    Args:
+        filas (iterable): Países estructurados.
+        predicado (callable): Función fila -> bool (ej.: lambda p: p["Región"] == "Europe").
+    
+    Yields:
+        dict: Filas que cumplen el predicado, sin copiarlas.
+    """
+    return (fila for fila in filas if predicado(fila))
+
+def proyectar_filas(filas, campos):
+    """
+    Etapa de pipeline que conserva únicamente los campos indicados de cada fila.
+    
+    Args:
+        filas (iterable): Países estructurados.
+        campos (iterable): Campos a conservar, en el orden deseado (ej.: ["Nombre", "Población"]).
+    
+    Yields:
+        dict: Nueva fila con solo los campos solicitados.
+    """
+    campos = tuple(campos)
+    return ({campo: fila[campo] for campo in campos} for fila in filas)
+
+class SumideroLista:
+    """Sumidero que acumula las filas recibidas en una lista."""
+    def __init__(self):
+        self.filas = []
+    
+    def agregar(self, fila):
+        self.filas.append(fila)
+    
+    def cerrar(self):
+        return self.filas
+    
+    def descartar(self):
+        # No hay recursos que liberar
+        pass
+
+class SumideroFiltrado:
+    """
+    Sumidero que reenvía a otro sumidero solo las filas que cumplen un predicado.
+    
+    Permite que una única pasada alimente, por ejemplo, un archivo con todos los países y otro
+    solo con los países filtrados.
+    
+    Args:
+        sumidero: Sumidero de destino (con métodos agregar y cerrar).
+        predicado (callable): Función fila -> bool.
+    """
+    def __init__(self, sumidero, predicado):
+        self.sumidero = sumidero
+        self.predicado = predicado
+    
+    def agregar(self, fila):
+        if self.predicado(fila):
+            self.sumidero.agregar(fila)
+    
+    def cerrar(self):
+        return self.sumidero.cerrar()
+    
+    def descartar(self):
+        _descartar_sumidero(self.sumidero)
+
+class SumideroJSON:
+    """
+    Sumidero que escribe las filas en un archivo JSON a medida que llegan.
+    
+    El archivo resultante tiene el mismo formato que guardar_datos_json (indentación de 4 espacios,
+    caracteres no ASCII conservados), pero sin mantener la lista completa en memoria.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo JSON de salida.
+    """
+    def __init__(self, nombre_archivo):
+        self.nombre_archivo = nombre_archivo
+        # El archivo se publica de forma atómica al cerrar el sumidero
+        self.archivo = ArchivoAtomico(nombre_archivo, "w")
+        self.total = 0
+    
+    def agregar(self, fila):
+        # Cada elemento se serializa por separado y se indenta un nivel dentro del arreglo
+        texto = json.dumps(fila, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+        self.archivo.write(("[\n    " if self.total == 0 else ",\n    ") + texto)
+        self.total += 1
+    
+    def cerrar(self):
+        self.archivo.write("\n]" if self.total else "[]")
+        self.archivo.confirmar()
+        print(f"Datos guardados en {self.nombre_archivo}")
+        return self.total
+    
+    def descartar(self):
+        # Elimina el archivo temporal: el archivo anterior (si existe) queda intacto
+        self.archivo.descartar()
+
+class SumideroExcel:
+    """
+    Sumidero que escribe las filas recibidas en un archivo Excel a medida que llegan.
+    
+    Usa EscritorExcel (modo de solo escritura de openpyxl), así que no acumula las filas en memoria;
+    las columnas se toman de la primera fila recibida.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .xlsx de salida.
+        nombre_hoja (str): Nombre de la hoja. Por defecto: "Sheet1".
+    """
+    def __init__(self, nombre_archivo, nombre_hoja="Sheet1"):
+        self.nombre_archivo = nombre_archivo
+        self.nombre_hoja = nombre_hoja
+        self.libro = EscritorExcel(nombre_archivo)
+    
+    def agregar(self, fila):
+        if self.nombre_hoja not in self.libro.hojas:
+            self.libro.agregar_hoja(self.nombre_hoja, list(fila))
+        self.libro.agregar(self.nombre_hoja, fila)
+    
+    def cerrar(self):
+        total = self.libro.cerrar().get(self.nombre_hoja, 0)
+        print(f"Datos exportados exitosamente a {self.nombre_archivo}")
+        return total
+    
+    def descartar(self):
+        self.libro.descartar()
+
+def ejecutar_pipeline(filas, sumideros):
+    """
+    Recorre las filas una sola vez y entrega cada una a todos los sumideros.
+    
+    Sustituye el patrón de recorrer la misma lista varias veces (guardar JSON, filtrar, exportar, ...)
+    por una única pasada sobre un iterador, sin listas intermedias.
+    
+    Args:
+        filas (iterable): Países estructurados (ej.: iterar_paises_estructurados(iterar_datos_paises())).
+        sumideros (dict): Nombre -> sumidero (objeto con métodos agregar(fila), cerrar() y, opcionalmente,
+                          descartar()).
+    
+    Returns:
+        dict: Nombre -> resultado devuelto por cerrar() de cada sumidero.
+    
+    Raises:
+        Exception: La primera excepción de la pasada o de un cerrar(). Si la pasada falla, los sumideros
+                   se descartan en lugar de cerrarse, de modo que no se publican archivos incompletos.
+    
+    Ejemplo de uso:
+        resultados = ejecutar_pipeline(
+            iterar_paises_estructurados(iterar_datos_paises()),
+            {
+                "json": SumideroJSON("datos_paises.json"),
+                "europa": SumideroFiltrado(SumideroLista(), lambda p: p["Región"] == "Europe"),
+            }
+        )
+    """
+    try:
+        for fila in filas:
+            for sumidero in sumideros.values():
+                sumidero.agregar(fila)
+    except BaseException:
+        # La pasada quedó incompleta: descartar todo en lugar de publicar archivos truncados
+        for sumidero in sumideros.values():
+            _descartar_sumidero(sumidero)
+        raise
+    
+    # Cerrar cada sumidero por separado para que un fallo no impida cerrar los demás
+    resultados, primer_error = {}, None
+    for nombre, sumidero in sumideros.items():
+        try:
+            resultados[nombre] = sumidero.cerrar()
+        except Exception as e:
+            _descartar_sumidero(sumidero)
+            primer_error = primer_error or e
+    if primer_error is not None:
+        raise primer_error
+    return resultados
+
+def _descartar_sumidero(sumidero):
+    # Los sumideros sin descartar() (definidos fuera del módulo) se cierran para liberar sus recursos
+    try:
+        getattr(sumidero, "descartar", sumidero.cerrar)()
+    except Exception:
+        pass
+
+def calcular_densidades(poblaciones, areas):
+    """
+    Versión vectorizada de calcular_densidad: calcula la densidad de muchos países en una sola operación.
+    
+    Conserva la semántica de calcular_densidad: densidad 0 cuando el área es <= 0 y redondeo a
+    2 decimales idéntico al de round() de Python (los pocos valores que caen justo en la mitad
+    de un centésimo se redondean con round() para no depender del redondeo binario de NumPy).
+    
+    Args:
+        poblaciones (array-like): Población de cada país.
+        areas (array-like): Área de cada país en km².
+    
+    Returns:
+        numpy.ndarray: Densidades (float64) en el mismo orden que las entradas.
+    
+    Ejemplo de uso:
+        calcular_densidades([50_882_891, 451], [1_141_748, 0])  # -> array([44.57, 0.])
+    """
+    poblaciones = np.asarray(poblaciones, dtype=np.float64)
+    areas = np.asarray(areas, dtype=np.float64)
+    
+    # Dividir solo donde el área es positiva; el resto queda en 0
+    validas = areas > 0
+    densidades = np.divide(poblaciones, areas, out=np.zeros_like(poblaciones), where=validas)
+    redondeadas = np.round(densidades, 2)
+    
+    # Casos frontera (fracción de centésimo ~0.5): usar round() para reproducir calcular_densidad
+    centesimos = densidades * 100
+    dudosos = np.flatnonzero(np.abs(centesimos - np.floor(centesimos) - 0.5) <= 1e-6)
+    for i in dudosos:
+        redondeadas[i] = round(float(densidades[i]), 2)
+    return redondeadas
+
+def calcular_metricas_densidad(poblaciones, areas):
+    """
+    Calcula en una sola pasada la densidad y métricas derivadas para un conjunto de países.
+    
+    Args:
+        poblaciones (array-like): Población de cada país.
+        areas (array-like): Área de cada país en km².
+    
+    Returns:
+        dict: Arreglos NumPy alineados con las entradas:
+            - Densidad (hab/km²): Igual que calcular_densidades.
+            - Log10 Densidad: Logaritmo base 10 de la densidad (NaN si la densidad es 0).
+            - Rango Densidad: 1 para el país más denso; los empates comparten el menor rango.
+            - Percentil Densidad: Porcentaje de países con densidad menor o igual (0-100).
+    """
+    densidades = calcular_densidades(poblaciones, areas)
+    total = len(densidades)
+    
+    log_densidad = np.full(total, np.nan)
+    np.log10(densidades, out=log_densidad, where=densidades > 0)
+    
+    # Un solo ordenamiento alimenta rango y percentil mediante búsqueda binaria
+    ordenadas = np.sort(densidades)
+    rango = total - np.searchsorted(ordenadas, densidades, side="right") + 1
+    percentil = (np.searchsorted(ordenadas, densidades, side="right") / total * 100) if total else np.zeros(0)
+    
+    return {
+        "Densidad (hab/km²)": densidades,
+        "Log10 Densidad": log_densidad,
+        "Rango Densidad": rango.astype(np.int64),
+        "Percentil Densidad": np.round(percentil, 2),
+    }
+
+"""
+modulo.py - Funciones adicionales para manejo de archivos y filtrado con expresiones regulares.
+"""
+"""
+modulo.py - Escritura atómica de archivos con bloqueo consultivo.
+"""
+# Tiempo máximo de espera (segundos) para obtener el bloqueo de un archivo de salida
+ESPERA_BLOQUEO_SEGUNDOS = 60
+# Archivo de bloqueo compartido por todas las escrituras de un mismo directorio de salida
+NOMBRE_ARCHIVO_BLOQUEO = ".pia_escritura.lock"
+# Máscara de permisos del proceso, leída una sola vez al cargar el módulo: consultarla exige
+# cambiarla momentáneamente (os.umask), lo que no es seguro con varios hilos creando archivos
+_MASCARA_PERMISOS = os.umask(0o022)
+os.umask(_MASCARA_PERMISOS)
+
+# Bloqueos obtenidos por este proceso: ruta del archivo de bloqueo -> [archivo abierto, usos activos].
+# flock/msvcrt bloquean por archivo abierto, así que dentro del proceso se comparte un único bloqueo
+# por directorio en lugar de abrirlo dos veces (lo que haría que el proceso se bloquease a sí mismo)
+_BLOQUEOS_PROCESO = {}
+_CANDADO_BLOQUEOS = threading.Lock()
+# Serializa las adquisiciones: un segundo hilo encuentra el bloqueo ya registrado en lugar de abrir otro
+_CANDADO_ADQUISICION = threading.Lock()
+
+class ArchivoAtomico:
+    """
+    Archivo de salida que solo reemplaza al destino cuando la escritura termina correctamente.
+    
+    Los datos se escriben en un archivo temporal del mismo directorio; al confirmar se fuerza su
+    escritura a disco (fsync) y se renombra sobre el destino con os.replace, que es atómico. Así,
+    una interrupción a mitad de escritura deja intacto el archivo anterior en lugar de uno truncado.
+    Además, mientras está abierto mantiene un bloqueo consultivo sobre el archivo
+    NOMBRE_ARCHIVO_BLOQUEO del directorio destino (uno por directorio, no uno por archivo), de modo
+    que varias ejecuciones de PIA_Script.py que comparten directorio de salida escriben por turnos.
+    Dentro de un mismo proceso el bloqueo se comparte, así que varios ArchivoAtomico abiertos a la
+    vez (ej.: los sumideros de ejecutar_pipeline) no se esperan entre sí.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo destino.
+        modo (str): "w" (texto UTF-8) o "wb" (binario). Por defecto: "w".
+        bloquear (bool): Si es True, obtiene el bloqueo consultivo antes de escribir. Por defecto: True.
+        espera_bloqueo (float): Segundos máximos de espera por el bloqueo. Por defecto: ESPERA_BLOQUEO_SEGUNDOS.
+    
+    Ejemplo de uso:
+        with ArchivoAtomico("datos_paises.json") as f:
+            json.dump(datos, f)
+        # Si ocurre una excepción dentro del bloque, el archivo temporal se descarta
+    """
+    def __init__(self, nombre_archivo, modo="w", bloquear=True, espera_bloqueo=ESPERA_BLOQUEO_SEGUNDOS):
+        self.nombre_archivo = nombre_archivo
+        self.bloqueo = None
+        directorio = os.path.dirname(os.path.abspath(nombre_archivo))
+        if bloquear:
+            self.bloqueo = _obtener_bloqueo(os.path.join(directorio, NOMBRE_ARCHIVO_BLOQUEO), espera_bloqueo)
+        try:
+            descriptor, self.ruta_temporal = tempfile.mkstemp(
+                prefix=f".{os.path.basename(nombre_archivo)}.", suffix=".tmp", dir=directorio
+            )
+            # mkstemp crea el archivo con permisos 0600; se aplican los del destino o los habituales
+            os.chmod(self.ruta_temporal, _permisos_destino(nombre_archivo))
+            if "b" in modo:
+                self.archivo = os.fdopen(descriptor, modo)
+            else:
+                self.archivo = os.fdopen(descriptor, modo, encoding="utf-8", newline="")
+        except OSError:
+            self._liberar_bloqueo()
+            raise
+    
+    def write(self, texto):
+        return self.archivo.write(texto)
+    
+    def confirmar(self):
+        """Vuelca el archivo temporal a disco y lo renombra sobre el destino."""
+        try:
+            self.archivo.flush()
+            os.fsync(self.archivo.fileno())
+            self.archivo.close()
+            os.replace(self.ruta_temporal, self.nombre_archivo)
+            _sincronizar_directorio(os.path.dirname(os.path.abspath(self.nombre_archivo)))
+        except OSError:
+            self.descartar()
+            raise
+        finally:
+            self._liberar_bloqueo()
+    
+    def descartar(self):
+        """Elimina el archivo temporal sin tocar el destino."""
+        self.archivo.close()
+        try:
+            os.remove(self.ruta_temporal)
+        except OSError:
+            pass
+        self._liberar_bloqueo()
+    
+    def _liberar_bloqueo(self):
+        if self.bloqueo is not None:
+            _liberar_bloqueo(self.bloqueo)
+            self.bloqueo = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, tipo_excepcion, excepcion, traza):
+        if tipo_excepcion is None:
+            self.confirmar()
+        else:
+            self.descartar()
+        return False
+
+def _permisos_destino(nombre_archivo):
+    try:
+        return os.stat(nombre_archivo).st_mode & 0o777
+    except OSError:
+        # Archivo nuevo: permisos por defecto del proceso (0666 menos la máscara umask)
+        return 0o666 & ~_MASCARA_PERMISOS
+
+def _obtener_bloqueo(ruta_bloqueo, espera_maxima):
+    # Devuelve la ruta del bloqueo como identificador para _liberar_bloqueo
+    with _CANDADO_ADQUISICION:
+        with _CANDADO_BLOQUEOS:
+            if ruta_bloqueo in _BLOQUEOS_PROCESO:
+                _BLOQUEOS_PROCESO[ruta_bloqueo][1] += 1
+                return ruta_bloqueo
+        
+        # El archivo de bloqueo no se borra al liberar: eliminarlo permitiría que dos procesos bloqueen archivos distintos
+        archivo = open(ruta_bloqueo, "a+")
+        limite = time.monotonic() + espera_maxima
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(archivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt is not None:
+                    archivo.seek(0)
+                    msvcrt.locking(archivo.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= limite:
+                    archivo.close()
+                    raise TimeoutError(f"No se obtuvo el bloqueo de {ruta_bloqueo} en {espera_maxima} s")
+                time.sleep(0.05)
+        
+        with _CANDADO_BLOQUEOS:
+            _BLOQUEOS_PROCESO[ruta_bloqueo] = [archivo, 1]
+        return ruta_bloqueo
+
+def _liberar_bloqueo(ruta_bloqueo):
+    with _CANDADO_BLOQUEOS:
+        registro = _BLOQUEOS_PROCESO[ruta_bloqueo]
+        registro[1] -= 1
+        if registro[1]:
+            return
+        del _BLOQUEOS_PROCESO[ruta_bloqueo]
+    archivo = registro[0]
+    try:
+        if fcntl is not None:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            archivo.seek(0)
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+    finally:
+        archivo.close()
+
+def _sincronizar_directorio(directorio):
+    # En POSIX el renombrado solo es duradero cuando se sincroniza la entrada del directorio
+    if os.name != "posix":
+        return
+    descriptor = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+# Firmas de los formatos de compresión admitidos para archivos JSON
+FIRMAS_COMPRESION = {b"\x1f\x8b": "gzip", b"\x28\xb5\x2f\xfd": "zstd"}
+EXTENSIONES_COMPRESION = {".gz": "gzip", ".zst": "zstd"}
+
+def _modulo_zstd():
+    # Importación diferida: zstandard es opcional y solo se necesita para archivos .zst
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("La compresión zstd requiere el paquete 'zstandard' (pip install zstandard).")
+    return zstandard
+
+def serializar_json(datos, compacto=False):
+    """
+    Convierte datos a JSON codificado en UTF-8.
+    
+    En modo compacto (sin espacios ni saltos de línea) se usa orjson si está instalado, que es
+    mucho más rápido que el módulo json estándar; en modo legible se mantiene el formato de
+    siempre (indentación de 4 espacios) con el módulo estándar.
+    
+    Args:
+        datos (list | dict): Datos a serializar.
+        compacto (bool): Si es True, genera JSON sin espacios. Por defecto: False.
+    
+    Returns:
+        bytes: Documento JSON en UTF-8 (los caracteres no ASCII se conservan tal cual).
+    """
+    if compacto:
+        if orjson is not None:
+            return orjson.dumps(datos)
+        return json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(datos, indent=4, ensure_ascii=False).encode("utf-8")
+
+def deserializar_json(contenido):
+    """
+    Decodifica un documento JSON (bytes o str), usando orjson si está instalado.
+    
+    Raises:
+        ValueError: Si el contenido no es JSON válido.
+    """
+    if orjson is not None:
+        return orjson.loads(contenido)
+    return json.loads(contenido)
+
+def _comprimir(contenido, compresion):
+    if compresion == "gzip":
+        return gzip.compress(contenido)
+    if compresion == "zstd":
+        return _modulo_zstd().ZstdCompressor().compress(contenido)
+    if compresion:
+        raise ValueError(f"Compresión no soportada: {compresion!r}. Use 'gzip' o 'zstd'.")
+    return contenido
+
+def _descomprimir(contenido):
+    # Detectar la compresión por la firma del archivo, independientemente de la extensión.
+    # Un archivo dañado o truncado lanza ValueError, igual que un JSON inválido
+    for firma, compresion in FIRMAS_COMPRESION.items():
+        if contenido.startswith(firma):
+            if compresion == "gzip":
+                try:
+                    return gzip.decompress(contenido)
+                except (OSError, EOFError, zlib.error) as e:
+                    raise ValueError(f"archivo gzip dañado: {e}") from e
+            zstandard = _modulo_zstd()
+            try:
+                return zstandard.ZstdDecompressor().decompressobj().decompress(contenido)
+            except zstandard.ZstdError as e:
+                raise ValueError(f"archivo zstd dañado: {e}") from e
+    return contenido
+
+def guardar_datos_json(datos, nombre_archivo="datos_paises.json", compacto=False, compresion=None):
+    """
+    Guarda datos estructurados (lista de diccionarios) en un archivo JSON con formato legible.
+    
+    Este método asegura que los caracteres no ASCII (ej.: tildes, símbolos) se conserven correctamente.
+    El archivo generado puede usarse para persistencia de datos, análisis posterior o compartir información estructurada.
+    Para instantáneas que no leerán personas, el modo compacto y la compresión reducen mucho el tamaño
+    y el tiempo de escritura; cargar_datos_json lee cualquiera de las variantes.
+    
+    Args:
+        datos (list): Lista de diccionarios con datos de países (ej.: [{"Nombre": "Colombia", ...}]). 
+        nombre_archivo (str): Nombre del archivo JSON de salida. Por defecto: "datos_paises.json".
+        compacto (bool): Si es True, escribe JSON sin indentación (con orjson si está disponible). Por defecto: False.
+        compresion (str): "gzip" o "zstd". Por defecto se deduce de la extensión (".gz", ".zst"); sin extensión conocida, sin compresión.
+    
+    Returns:
+        None: La función no devuelve valores, pero imprime mensajes de éxito o error.
+    
+    Ejemplo de uso:
+        guardar_datos_json(datos_estructurados, "paises_filtrados.json")
+        guardar_datos_json(datos_estructurados, "instantanea.json.gz", compacto=True)
+    """
+    try:
+        if isinstance(datos, TablaPaises):
+            datos = datos.a_filas()
+        
+        # Guardar datos en formato JSON (legible con indentación, o compacto)
+        # Los caracteres no ASCII se mantienen (ej.: "España" en lugar de "Espa\\u00f1a")
+        compresion = compresion or EXTENSIONES_COMPRESION.get(os.path.splitext(nombre_archivo)[1].lower())
+        contenido = _comprimir(serializar_json(datos, compacto), compresion)
+        
+        # Escribir en modo binario: el contenido ya está codificado en UTF-8 (y comprimido si corresponde)
+        # La escritura es atómica: si algo falla, el archivo anterior queda intacto
+        with ArchivoAtomico(nombre_archivo, "wb") as f:
+            f.write(contenido)
+        
+        # Confirmación de guardado exitoso
+        print(f"Datos guardados en {nombre_archivo}")
+        
+    except Exception as e:
+        # Capturar errores comunes como permisos insuficientes o rutas inválidas
+        print(f"Error al guardar el archivo: {e}")
+
+def cargar_datos_json(nombre_archivo="datos_paises.json"):
+    """
+    Carga un archivo guardado con guardar_datos_json (legible, compacto, gzip o zstd).
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo JSON. Por defecto: "datos_paises.json".
+    
+    Returns:
+        list: Datos contenidos en el archivo.
+        None: Si el archivo no existe, está dañado (gzip o zstd) o no es JSON válido (el error se informa en consola).
+    """
+    try:
+        with open(nombre_archivo, "rb") as f:
+            return deserializar_json(_descomprimir(f.read()))
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error al cargar el archivo: {e}")
+        return None
+
+# Tipos esperados por columna en una instantánea de países estructurados
+TIPOS_COLUMNAS_INSTANTANEA = {
+    "Nombre": str,
+    "Población": int,
+    "Área (km²)": (int, float),
+    "Densidad (hab/km²)": (int, float),
+    "Región": str,
+    "Subregión": str,
+    "Idiomas": str,
+    "Monedas": str,
+    "Nombre Normalizado": str,
+}
+
+def cargar_instantanea_paises(nombre_archivo="datos_paises.json", columnar=False):
+    """
+    Carga países ya estructurados desde una instantánea guardada con guardar_datos_json.
+    
+    Permite ejecutar filtros, estadísticas y exportaciones sin consultar la API: la instantánea
+    se valida contra las columnas de ESQUEMA_PAISES y se devuelve lista para usarse, igual que el
+    resultado de estructurar_datos_paises. Las instantáneas antiguas sin la columna
+    "Nombre Normalizado" se completan calculándola a partir de "Nombre".
+    
+    Args:
+        nombre_archivo (str): Ruta de la instantánea (JSON legible, compacto o comprimido, o .npz columnar).
+                              Por defecto: "datos_paises.json".
+        columnar (bool): Si es True, devuelve una TablaPaises en lugar de una lista. Por defecto: False.
+    
+    Returns:
+        list | TablaPaises: Países estructurados.
+        None: Si el archivo no se puede leer o no cumple el esquema (el motivo se informa en consola).
+    
+    Ejemplo de uso:
+        datos_estructurados = cargar_instantanea_paises("datos_paises.json")
+        filtrar_paises_con_regex(datos_estructurados, "^A")
+    """
+    if nombre_archivo.lower().endswith(".npz"):
+        # Instantánea columnar binaria (guardar_instantanea_columnar): ya está tipada y validada
+        tabla = cargar_instantanea_columnar(nombre_archivo)
+        if tabla is None or columnar:
+            return tabla
+        return tabla.a_filas()
+    
+    datos = cargar_datos_json(nombre_archivo)
+    if datos is None:
+        return None
+    if not isinstance(datos, list):
+        print(f"Instantánea inválida en {nombre_archivo}: se esperaba una lista de países.")
+        return None
+    
+    for posicion, fila in enumerate(datos):
+        if not isinstance(fila, dict):
+            print(f"Instantánea inválida en {nombre_archivo}: el elemento {posicion} no es un objeto.")
+            return None
+        if "Nombre Normalizado" not in fila and isinstance(fila.get("Nombre"), str):
+            fila["Nombre Normalizado"] = normalizar_texto(fila["Nombre"])
+        for campo, tipo in TIPOS_COLUMNAS_INSTANTANEA.items():
+            # bool es subclase de int, pero no es un valor válido para columnas numéricas
+            if campo not in fila or not isinstance(fila[campo], tipo) or isinstance(fila[campo], bool):
+                print(f"Instantánea inválida en {nombre_archivo}: el elemento {posicion} "
+                      f"no tiene un valor válido para '{campo}'.")
+                return None
+    
+    return TablaPaises.desde_filas(datos) if columnar else datos
+
+# Versión del formato de instantánea columnar (.npz) que escribe guardar_instantanea_columnar
+VERSION_INSTANTANEA_COLUMNAR = 1
+
+def _codificar_textos(valores):
+    # Cadenas -> (bytes UTF-8 concatenados, desplazamientos); evita guardar arreglos de objetos con pickle
+    codificados = [str(valor).encode("utf-8") for valor in valores]
+    desplazamientos = np.zeros(len(codificados) + 1, dtype=np.int64)
+    np.cumsum([len(texto) for texto in codificados], out=desplazamientos[1:])
+    return np.frombuffer(b"".join(codificados), dtype=np.uint8), desplazamientos
+
+def _decodificar_textos(datos, desplazamientos):
+    contenido = datos.tobytes()
+    return np.array([sys.intern(contenido[inicio:fin].decode("utf-8"))
+                     for inicio, fin in zip(desplazamientos[:-1].tolist(), desplazamientos[1:].tolist())], dtype=object)
+
+def guardar_instantanea_columnar(datos, nombre_archivo="datos_paises.npz"):
+    """
+    Guarda países estructurados como instantánea columnar binaria (archivo .npz de NumPy).
+    
+    Cada columna se guarda con su tipo: las numéricas como arreglos int64/float64, "Región" y
+    "Subregión" codificadas por diccionario (códigos enteros + categorías) y el texto como bytes
+    UTF-8 con desplazamientos. Los miembros del .npz se guardan sin comprimir para que
+    cargar_instantanea_columnar pueda mapearlos en memoria en lugar de leerlos y analizarlos.
+    
+    Args:
+        datos (list | TablaPaises): Países estructurados (ej.: salida de estructurar_datos_paises).
+        nombre_archivo (str): Ruta del archivo de salida. Por defecto: "datos_paises.npz".
+    
+    Returns:
+        None: La función no devuelve valores, pero imprime mensajes de éxito o error.
+    
+    Ejemplo de uso:
+        guardar_instantanea_columnar(datos_estructurados, "datos_paises.npz")
+    """
+    try:
+        if not isinstance(datos, TablaPaises):
+            datos = TablaPaises.desde_filas(datos, campos=list(datos[0]) if datos else None)
+        
+        arreglos, columnas = {}, []
+        for posicion, campo in enumerate(datos.campos):
+            clave = f"c{posicion}"
+            if campo in datos._categorias:
+                codigos, categorias = datos.codigos(campo)
+                arreglos[clave] = codigos
+                arreglos[clave + "_categorias"], arreglos[clave + "_desplazamientos"] = _codificar_textos(categorias)
+                columnas.append({"campo": campo, "tipo": "categorica"})
+            elif datos._columnas[campo].dtype.kind in "biuf":
+                arreglos[clave] = datos._columnas[campo]
+                columnas.append({"campo": campo, "tipo": "numerica"})
+            else:
+                arreglos[clave], arreglos[clave + "_desplazamientos"] = _codificar_textos(datos._columnas[campo])
+                columnas.append({"campo": campo, "tipo": "texto"})
+        
+        # Metadatos (orden y tipo de cada columna) como JSON UTF-8 dentro del propio .npz
+        metadatos = {"version": VERSION_INSTANTANEA_COLUMNAR, "filas": len(datos), "columnas": columnas}
+        arreglos["metadatos"] = np.frombuffer(json.dumps(metadatos, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+        
+        # np.savez (sin compresión) escribe cada arreglo como un .npy contiguo dentro del zip
+        with ArchivoAtomico(nombre_archivo, "wb") as f:
+            np.savez(f.archivo, **arreglos)
+        print(f"Datos guardados en {nombre_archivo}")
+    
+    except Exception as e:
+        print(f"Error al guardar el archivo: {e}")
+
+def _mapear_npz(nombre_archivo):
+    # Mapea en memoria cada miembro sin comprimir de un .npz; np.load ignora mmap_mode para archivos .npz
+    arreglos = {}
+    with zipfile.ZipFile(nombre_archivo) as contenedor, open(nombre_archivo, "rb") as f:
+        for miembro in contenedor.infolist():
+            clave = miembro.filename[:-len(".npy")]
+            if miembro.compress_type != zipfile.ZIP_STORED:
+                # Los bytes de un miembro comprimido no son el arreglo: mapearlos daría valores sin sentido
+                raise ValueError(f"el miembro '{miembro.filename}' está comprimido y no se puede mapear en memoria "
+                                 f"(guarde la instantánea con guardar_instantanea_columnar o use mapear=False)")
+            # Cabecera local del zip: 30 bytes fijos + nombre + campo extra (longitudes en los bytes 26-29)
+            f.seek(miembro.header_offset + 26)
+            longitud_nombre, longitud_extra = np.frombuffer(f.read(4), dtype="<u2").tolist()
+            f.seek(miembro.header_offset + 30 + longitud_nombre + longitud_extra)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                forma, orden_fortran, tipo = np.lib.format.read_array_header_1_0(f)
+            else:
+                forma, orden_fortran, tipo = np.lib.format.read_array_header_2_0(f)
+            if tipo.hasobject:
+                raise ValueError(f"La columna '{clave}' contiene objetos de Python; no se puede mapear.")
+            if math.prod(forma) == 0:
+                arreglos[clave] = np.empty(forma, dtype=tipo)
+            else:
+                arreglos[clave] = np.memmap(nombre_archivo, dtype=tipo, mode="r", offset=f.tell(),
+                                            shape=forma, order="F" if orden_fortran else "C")
+    return arreglos
+
+def cargar_instantanea_columnar(nombre_archivo="datos_paises.npz", mapear=True):
+    """
+    Carga una instantánea escrita por guardar_instantanea_columnar como TablaPaises.
+    
+    Con `mapear=True` las columnas numéricas y los códigos de las categóricas se mapean en memoria
+    directamente desde el archivo (no se leen hasta que se usan); solo el texto se decodifica.
+    Para ello los miembros del .npz deben estar sin comprimir: un archivo escrito con
+    np.savez_compressed se rechaza (solo puede cargarse con `mapear=False`).
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .npz. Por defecto: "datos_paises.npz".
+        mapear (bool): Si es True, mapea las columnas en memoria; si es False, las lee completas. Por defecto: True.
+    
+    Returns:
+        TablaPaises: Tabla con las mismas columnas, tipos y valores que la guardada.
+        None: Si el archivo no existe o no es una instantánea válida (el error se informa en consola).
+    
+    Ejemplo de uso:
+        tabla = cargar_instantanea_columnar("datos_paises.npz")
+        tabla.columna("Población").sum()
+    """
+    try:
+        if mapear:
+            arreglos = _mapear_npz(nombre_archivo)
+        else:
+            with np.load(nombre_archivo, allow_pickle=False) as contenido:
+                arreglos = {clave: contenido[clave] for clave in contenido.files}
+        
+        metadatos = json.loads(arreglos["metadatos"].tobytes().decode("utf-8"))
+        if metadatos.get("version") != VERSION_INSTANTANEA_COLUMNAR:
+            raise ValueError(f"versión de formato no soportada: {metadatos.get('version')}")
+        
+        columnas, categorias, campos = {}, {}, []
+        for posicion, columna in enumerate(metadatos["columnas"]):
+            clave, campo = f"c{posicion}", columna["campo"]
+            if columna["tipo"] == "categorica":
+                columnas[campo] = arreglos[clave]
+                categorias[campo] = _decodificar_textos(arreglos[clave + "_categorias"], arreglos[clave + "_desplazamientos"])
+            elif columna["tipo"] == "numerica":
+                columnas[campo] = arreglos[clave]
+            else:
+                columnas[campo] = _decodificar_textos(arreglos[clave], arreglos[clave + "_desplazamientos"])
+            if len(columnas[campo]) != metadatos["filas"]:
+                raise ValueError(f"la columna '{campo}' no tiene {metadatos['filas']} filas")
+            campos.append(campo)
+        return TablaPaises(columnas, categorias, campos)
+    
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        print(f"Error al cargar el archivo: {e}")
+        return None
+
+def filtrar_paises_con_regex(datos_estructurados, patron_regex, indice=None):
+    """
+    Filtra países cuyo nombre cumple con un patrón de expresión regular.
+    
+    Las expresiones regulares permiten búsquedas avanzadas (ej.: países que comienzan con "A", terminan en "land", etc.).
+    Se usa `re.IGNORECASE` para hacer la búsqueda insensible a mayúsculas/minúsculas.
+    
+    Args:
+        datos_estructurados (list): Lista de diccionarios con datos de países. 
+        patron_regex (str): Patrón de expresión regular válido (ej.: "^A" para nombres que empiezan con A).
+        indice (IndiceNombres): Índice de nombres construido sobre `datos_estructurados` (opcional).
+                                Si se indica, los patrones anclados o literales se resuelven con el índice.
+    
+    Returns:
+        list: Lista de países que coinciden con el patrón. Vacía si hay errores o no hay coincidencias.
+        TablaPaises: Subtabla con las coincidencias, si `datos_estructurados` es una TablaPaises.
+    
+    Ejemplos de patrones útiles:
+        - "^A": Países que comienzan con "A" (ej.: Argentina, Alemania).
+        - "land$": Países que terminan con "land" (ej.: Finlandia, Islandia).
+        - "[0-9]": Países con números en su nombre (ej.: 3 de Mayo en Colombia).
+    """
+    if indice is not None:
+        # El índice aplica su propio planificador y verifica los candidatos con la expresión regular
+        return indice.filtrar(patron_regex)
+    
+    try:
+        # Compilar el patrón (o reutilizarlo desde la caché) con bandera para ignorar mayúsculas/minúsculas
+        regex = compilar_patron(patron_regex)
+        
+        # Tabla columnar: construir una máscara sobre la columna de nombres y devolver la subtabla
+        if isinstance(datos_estructurados, TablaPaises):
+            nombres = datos_estructurados.columna("Nombre")
+            return datos_estructurados.seleccionar(np.fromiter(
+                (regex.search(nombre) is not None for nombre in nombres), dtype=bool, count=len(nombres)
+            ))
+        
+        # Usar comprensión de listas para filtrar países cuyo nombre cumple el patrón
+        return [pais for pais in datos_estructurados if regex.search(pais["Nombre"])]
+    
+    except re.error as e:
+        # Manejar errores de sintaxis en el patrón de regex (ej.: patrón inválido)
+        print(f"Error en la expresión regular: {e}")
+        return []
+
+@functools.lru_cache(maxsize=512)
+def compilar_patron(patron_regex, banderas=re.IGNORECASE):
+    """
+    Compila un patrón de expresión regular y guarda el resultado en una caché LRU.
+    
+    Las consultas repetidas con el mismo patrón reutilizan el objeto compilado en lugar de volver
+    a analizarlo (tamaño de caché: 512 patrones).
+    
+    Args:
+        patron_regex (str): Patrón de expresión regular.
+        banderas (int): Banderas de compilación. Por defecto: re.IGNORECASE.
+    
+    Returns:
+        re.Pattern: Patrón compilado.
+    
+    Raises:
+        re.error: Si el patrón no es válido.
+    """
+    return re.compile(patron_regex, banderas)
+
+@functools.lru_cache(maxsize=128)
+def _compilar_multipatron(patrones):
+    """
+    Combina varios patrones en una sola expresión con un lookahead opcional y un grupo nombrado por patrón.
+    
+    Cada lookahead `(?=.*?(?P<_pN>patrón))` (ver _fragmento_multipatron) comprueba si el patrón aparece en alguna posición del
+    nombre sin consumir texto, de modo que una única llamada a match() indica qué patrones coinciden.
+    Los patrones inválidos o con referencias numéricas (\\1), que cambiarían de significado al
+    combinarse, se devuelven aparte para evaluarse individualmente.
+    
+    Returns:
+        tuple: (patrón combinado o None, lista de patrones individuales, errores por patrón).
+    """
+    combinables, individuales, errores = [], [], {}
+    for patron in patrones:
+        try:
+            compilar_patron(patron)
+        except re.error as e:
+            errores[patron] = e
+            continue
+        try:
+            # Ej.: banderas en línea "(?i)" solo son válidas al inicio y no pueden combinarse
+            re.compile(_fragmento_multipatron(0, patron))
+            (individuales if re.search(r"\\[1-9]", patron) else combinables).append(patron)
+        except re.error:
+            individuales.append(patron)
+    
+    combinado = None
+    if combinables:
+        try:
+            alternativas = "".join(_fragmento_multipatron(indice, patron) for indice, patron in enumerate(combinables))
+            combinado = (re.compile(alternativas, re.IGNORECASE), combinables)
+        except re.error:
+            # Ej.: dos patrones que definen el mismo grupo nombrado
+            individuales.extend(combinables)
+    return combinado, individuales, errores
+
+def _fragmento_multipatron(indice, patron):
+    # Lookahead opcional que captura en el grupo _pN si el patrón aparece en cualquier posición
+    return f"(?:(?=(?s:.*?)(?P<_p{indice}>(?:{patron}))))?"
+
+def filtrar_paises_multipatron(datos_estructurados, patrones):
+    """
+    Evalúa muchos patrones de expresión regular sobre los nombres de los países en un solo recorrido.
+    
+    Todos los patrones se combinan en una única expresión compilada (ver _compilar_multipatron), así
+    que cada nombre se examina una sola vez en lugar de una vez por patrón.
+    
+    Args:
+        datos_estructurados (list | TablaPaises): Países estructurados.
+        patrones (iterable): Patrones de expresión regular (ej.: ["^A", "land$", "ia$"]).
+    
+    Returns:
+        dict: Patrón -> lista de países que coinciden (o subtabla si los datos son una TablaPaises).
+              Los patrones inválidos se informan en consola y devuelven una lista vacía.
+    
+    Ejemplo de uso:
+        resultados = filtrar_paises_multipatron(datos_estructurados, ["^A", "land$"])
+        [pais["Nombre"] for pais in resultados["land$"]]
+    """
+    patrones = tuple(dict.fromkeys(patrones))
+    combinado, individuales, errores = _compilar_multipatron(patrones)
+    for patron, e in errores.items():
+        print(f"Error en la expresión regular '{patron}': {e}")
+    
+    es_tabla = isinstance(datos_estructurados, TablaPaises)
+    filas = list(datos_estructurados) if not es_tabla else None
+    nombres = datos_estructurados.columna("Nombre") if es_tabla else [pais["Nombre"] for pais in filas]
+    coincidencias = {patron: [] for patron in patrones}
+    
+    for posicion, nombre in enumerate(nombres):
+        if combinado:
+            regex, combinables = combinado
+            grupos = regex.match(nombre).groupdict()
+            for indice, patron in enumerate(combinables):
+                if grupos[f"_p{indice}"] is not None:
+                    coincidencias[patron].append(posicion)
+        for patron in individuales:
+            if compilar_patron(patron).search(nombre):
+                coincidencias[patron].append(posicion)
+    
+    if es_tabla:
+        return {patron: datos_estructurados.seleccionar(np.array(posiciones, dtype=np.intp))
+                for patron, posiciones in coincidencias.items()}
+    return {patron: [filas[posicion] for posicion in posiciones] for patron, posiciones in coincidencias.items()}
+
+"""
+modulo.py - Búsqueda normalizada (sin tildes ni mayúsculas) y alias de nombres a partir de las traducciones.
+"""
+def _normalizar_patron(patron_regex):
+    # Quitar diacríticos sin alterar la sintaxis de la expresión: solo se pliegan los caracteres
+    # no ASCII (ej.: "ß" -> "ss"), los ASCII quedan a cargo de re.IGNORECASE ("\D" no se convierte en "\d")
+    descompuesto = unicodedata.normalize("NFKD", patron_regex)
+    return "".join(c if c.isascii() else c.casefold() for c in descompuesto if not unicodedata.combining(c))
+
+def construir_tabla_alias(datos_crudos):
+    """
+    Construye una tabla de alias normalizados a partir de los nombres y traducciones de la API.
+    
+    Incluye el nombre común y oficial de cada país, sus traducciones (campo "translations") y sus
+    grafías alternativas (campo "altSpellings"), de modo que "Alemania", "Allemagne" o "Deutschland"
+    remitan a "Germany". Los datos crudos deben incluir esos campos, ej.:
+    obtener_datos_paises(campos=CAMPOS_API_ESTRUCTURA + CAMPOS_API_BUSQUEDA).
+    
+    Args:
+        datos_crudos (iterable): Países crudos de la API REST Countries.
+    
+    Returns:
+        dict: Alias normalizado -> tupla de nombres comunes (ej.: {"alemania": ("Germany",), ...}).
+    """
+    tabla = {}
+    for pais in datos_crudos:
+        try:
+            nombre = pais["name"]["common"]
+        except (KeyError, TypeError):
+            continue
+        variantes = [nombre, pais["name"].get("official", ""), *pais.get("altSpellings", [])]
+        for traduccion in pais.get("translations", {}).values():
+            variantes.extend((traduccion.get("common", ""), traduccion.get("official", "")))
+        for variante in filter(None, variantes):
+            nombres = tabla.setdefault(normalizar_texto(variante), [])
+            if nombre not in nombres:
+                nombres.append(nombre)
+    return {alias: tuple(nombres) for alias, nombres in tabla.items()}
+
+def buscar_paises_normalizado(datos_estructurados, patron_regex, alias=None):
+    """
+    Busca países con una expresión regular sin distinguir tildes ni mayúsculas.
+    
+    El patrón se normaliza igual que la columna "Nombre Normalizado" y se evalúa contra ella, por lo
+    que "Mexico" y "México", o "Peru" y "Perú", devuelven los mismos países. Si se proporciona una
+    tabla de alias (construir_tabla_alias), también coinciden los países cuyo nombre en otro idioma
+    cumple el patrón (ej.: "^Alemania$" -> Germany).
+    
+    Args:
+        datos_estructurados (list | TablaPaises): Países estructurados.
+        patron_regex (str): Patrón de expresión regular (ej.: "^mexico", "peru$").
+        alias (dict): Tabla de alias normalizados (opcional).
+    
+    Returns:
+        list: Países que coinciden, en el orden original (o subtabla si los datos son una TablaPaises).
+              Vacía si el patrón no es válido.
+    """
+    try:
+        regex = compilar_patron(_normalizar_patron(patron_regex))
+    except re.error as e:
+        print(f"Error en la expresión regular: {e}")
+        return []
+    
+    # Nombres comunes alcanzados a través de los alias (una pasada sobre la tabla de alias)
+    por_alias = {nombre for variante, nombres in (alias or {}).items() if regex.search(variante) for nombre in nombres}
+    
+    if isinstance(datos_estructurados, TablaPaises):
+        normalizados = datos_estructurados.columna("Nombre Normalizado")
+        nombres = datos_estructurados.columna("Nombre")
+        return datos_estructurados.seleccionar(np.fromiter(
+            (regex.search(normalizado) is not None or nombre in por_alias
+             for normalizado, nombre in zip(normalizados, nombres)),
+            dtype=bool, count=len(nombres)
+        ))
+    return [pais for pais in datos_estructurados
+            if regex.search(pais["Nombre Normalizado"]) or pais["Nombre"] in por_alias]
+
+"""
+modulo.py - Búsqueda aproximada de nombres (tolerante a errores de escritura) con un índice de trigramas.
+"""
+def distancia_levenshtein(a, b, limite=None):
+    """
+    Calcula la distancia de edición (inserciones, borrados y sustituciones) entre dos textos.
+    
+    Args:
+        a (str): Primer texto.
+        b (str): Segundo texto.
+        limite (int): Si se indica, el cálculo se detiene en cuanto la distancia supera este valor.
+    
+    Returns:
+        int: Distancia de edición (o `limite + 1` si se superó el límite).
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limite is not None and len(a) - len(b) > limite:
+        return limite + 1
+    anterior = list(range(len(b) + 1))
+    for i, caracter_a in enumerate(a, 1):
+        actual = [i]
+        for j, caracter_b in enumerate(b, 1):
+            actual.append(min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (caracter_a != caracter_b)))
+        if limite is not None and min(actual) > limite:
+            # Ninguna alineación puede volver a bajar del límite
+            return limite + 1
+        anterior = actual
+    return anterior[-1]
+
+def _trigramas_con_relleno(texto):
+    # Con dos caracteres de relleno a cada lado, cada carácter aparece en tres trigramas
+    relleno = f"\x02\x02{texto}\x03\x03"
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+class IndiceDifuso:
+    """
+    Índice de trigramas sobre nombres normalizados para encontrar los nombres más cercanos a un texto con errores.
+    
+    Cada edición (inserción, borrado o sustitución) altera como máximo 3 trigramas, así que un nombre a
+    distancia <= d del texto buscado comparte al menos (trigramas del texto - 3·d) trigramas con él.
+    El índice compara primero los nombres con más trigramas en común, reduce el radio de búsqueda en
+    cuanto tiene k resultados y se detiene cuando ningún candidato restante alcanza ese mínimo; la
+    distancia de edición se calcula de forma exacta, por lo que el resultado también lo es.
+    
+    Args:
+        alias (dict): Texto normalizado -> tupla de nombres comunes, como el que devuelve
+                      construir_tabla_alias (incluye nombres oficiales, grafías alternativas y traducciones).
+    
+    Ejemplo de uso:
+        indice = IndiceDifuso(construir_tabla_alias(datos_crudos))
+        indice.buscar("Argentna")  # -> [("Argentina", 1), ...]
+    """
+    def __init__(self, alias):
+        self.alias = alias
+        self._textos = list(alias)
+        self._trigramas = {}
+        for posicion, texto in enumerate(self._textos):
+            for trigrama in _trigramas_con_relleno(texto):
+                self._trigramas.setdefault(trigrama, []).append(posicion)
+    
+    @classmethod
+    def desde_datos(cls, datos_estructurados):
+        """Construye el índice solo con los nombres comunes de datos ya estructurados."""
+        alias = {}
+        for pais in datos_estructurados:
+            nombres = alias.setdefault(normalizar_texto(pais["Nombre"]), [])
+            if pais["Nombre"] not in nombres:
+                nombres.append(pais["Nombre"])
+        return cls({texto: tuple(nombres) for texto, nombres in alias.items()})
+    
+    def buscar(self, texto, k=5, distancia_maxima=None):
+        """
+        Devuelve los k nombres de país más cercanos al texto.
+        
+        Args:
+            texto (str): Texto buscado (se normaliza: sin tildes ni mayúsculas).
+            k (int): Cantidad máxima de países a devolver. Por defecto: 5.
+            distancia_maxima (int): Distancia de edición máxima aceptada.
+                                    Por defecto: un tercio de la longitud del texto (mínimo 2).
+        
+        Returns:
+            list: Tuplas (nombre común, distancia) ordenadas de menor a mayor distancia, sin países repetidos.
+        """
+        texto = normalizar_texto(texto)
+        radio = max(2, len(texto) // 3) if distancia_maxima is None else distancia_maxima
+        trigramas = _trigramas_con_relleno(texto)
+        
+        if len(trigramas) - 3 * radio > 0:
+            # Candidatos ordenados por trigramas compartidos: los más parecidos se comparan primero
+            conteo = Counter(posicion for trigrama in trigramas for posicion in self._trigramas.get(trigrama, ()))
+            candidatos = conteo.most_common()
+        else:
+            # Texto demasiado corto para filtrar por trigramas: filtrar solo por longitud
+            candidatos = [(posicion, len(trigramas)) for posicion, alias in enumerate(self._textos)
+                          if abs(len(alias) - len(texto)) <= radio]
+        
+        mejores = {}  # nombre común -> menor distancia encontrada
+        for posicion, compartidos in candidatos:
+            if compartidos < len(trigramas) - 3 * radio:
+                # Ningún candidato restante puede estar dentro del radio actual
+                break
+            alias = self._textos[posicion]
+            if (distancia := distancia_levenshtein(texto, alias, radio)) <= radio:
+                for nombre in self.alias[alias]:
+                    mejores[nombre] = min(distancia, mejores.get(nombre, distancia))
+                if len(mejores) >= k:
+                    # Con k países encontrados, el radio se reduce a la k-ésima mejor distancia
+                    radio = sorted(mejores.values())[k - 1]
+        return sorted(((nombre, distancia) for nombre, distancia in mejores.items() if distancia <= radio),
+                      key=lambda par: (par[1], par[0]))[:k]
+
+"""
+modulo.py - Filtrado por varios campos con condiciones de expresión regular y rangos numéricos.
+"""
+# Operadores de comparación admitidos en las condiciones de filtrar_paises
+OPERADORES_COMPARACION = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+def _es_compuesta(condicion):
+    return condicion[0] in ("y", "o")
+
+def _costo_condicion(condicion):
+    # Las comparaciones son más baratas que las expresiones regulares: se evalúan primero
+    if _es_compuesta(condicion):
+        return max((_costo_condicion(hija) for hija in condicion[1:]), default=0)
+    return 1 if condicion[1] == "~" else 0
+
+def _ordenar_condicion(condicion):
+    """Devuelve la condición con las hijas de cada "y"/"o" ordenadas por costo, una sola vez antes de recorrer filas."""
+    if not _es_compuesta(condicion):
+        return condicion
+    hijas = sorted((_ordenar_condicion(hija) for hija in condicion[1:]), key=_costo_condicion)
+    return (condicion[0], *hijas)
+
+def _es_numero(valor):
+    # bool es subclase de int, pero no es un valor numérico válido en una condición
+    return isinstance(valor, numbers.Real) and not isinstance(valor, bool)
+
+def _tipos_campos(datos_estructurados):
+    """
+    Deduce el tipo ("numero" o "texto") de cada campo para validar condiciones.
+    
+    Returns:
+        tuple: (tipos, estricto). `tipos` es campo -> "numero" | "texto" | None (None: sin comprobar).
+               `estricto` indica si los campos ausentes de `tipos` deben rechazarse (se conocen las columnas).
+    """
+    if isinstance(datos_estructurados, TablaPaises):
+        return {campo: "texto" if campo in datos_estructurados._categorias
+                else "numero" if datos_estructurados._columnas[campo].dtype.kind in "biuf" else "texto"
+                for campo in datos_estructurados.campos}, True
+    if isinstance(datos_estructurados, (list, tuple)) and datos_estructurados:
+        return {campo: "numero" if _es_numero(valor) else "texto" if isinstance(valor, str) else None
+                for campo, valor in datos_estructurados[0].items()}, True
+    # Sin filas que inspeccionar (lista vacía o iterador): tipos del esquema, sin rechazar otros campos
+    return {columna: "numero" if columna in TIPOS_COLUMNAS_NUMERICAS else "texto"
+            for columna, _, _ in ESQUEMA_PAISES}, False
+
+def _validar_condicion(condicion, tipos=None, estricto=False):
+    """
+    Comprueba la estructura y los tipos de una condición y precompila sus expresiones regulares.
+    
+    Args:
+        condicion (tuple): Condición simple o compuesta (ver filtrar_paises).
+        tipos (dict): Campo -> "numero" | "texto" (ver _tipos_campos). Opcional.
+        estricto (bool): Si es True, los campos que no están en `tipos` se rechazan.
+    
+    Raises:
+        ValueError: Si la condición, el campo, el operador o el tipo del valor no son válidos.
+        re.error: Si alguna expresión regular no es válida.
+    """
+    if not isinstance(condicion, (tuple, list)) or not condicion:
+        raise ValueError(f"Condición no válida: {condicion!r}. Use (campo, operador, valor).")
+    if _es_compuesta(condicion):
+        for hija in condicion[1:]:
+            _validar_condicion(hija, tipos, estricto)
+        return
+    if len(condicion) != 3:
+        raise ValueError(f"Condición no válida: {condicion!r}. Use (campo, operador, valor).")
+    campo, operador_condicion, valor = condicion
+    
+    tipos = tipos or {}
+    if campo not in tipos and estricto:
+        raise ValueError(f"Campo desconocido en la condición {condicion!r}: {campo!r}.")
+    tipo_campo = tipos.get(campo)
+    
+    if operador_condicion == "~":
+        # Expresión regular: requiere un patrón de texto y un campo de texto
+        if not isinstance(valor, str):
+            raise ValueError(f"El operador '~' requiere un patrón de texto: {condicion!r}")
+        if tipo_campo == "numero":
+            raise ValueError(f"El operador '~' requiere un campo de texto; '{campo}' es numérico.")
+        compilar_patron(valor)
+    elif operador_condicion == "entre":
+        # Rango: requiere (mínimo, máximo) numéricos y un campo numérico
+        if (not isinstance(valor, (tuple, list)) or len(valor) != 2
+                or not all(_es_numero(limite) for limite in valor)):
+            raise ValueError(f"El operador 'entre' requiere (mínimo, máximo) numéricos: {valor!r}")
+        if tipo_campo == "texto":
+            raise ValueError(f"El operador 'entre' requiere un campo numérico; '{campo}' es de texto.")
+    elif operador_condicion in ("==", "!="):
+        # Igualdad: el valor debe ser del mismo tipo que el campo
+        if tipo_campo == "numero" and not _es_numero(valor):
+            raise ValueError(f"'{campo}' es numérico; compárelo con un número: {condicion!r}")
+        if tipo_campo == "texto" and not isinstance(valor, str):
+            raise ValueError(f"'{campo}' es de texto; compárelo con un texto: {condicion!r}")
+    elif operador_condicion in OPERADORES_COMPARACION:
+        # Orden (>, >=, <, <=): solo entre números
+        if not _es_numero(valor):
+            raise ValueError(f"El operador '{operador_condicion}' requiere un valor numérico: {condicion!r}")
+        if tipo_campo == "texto":
+            raise ValueError(f"El operador '{operador_condicion}' requiere un campo numérico; '{campo}' es de texto.")
+    else:
+        raise ValueError(f"Operador no soportado: {operador_condicion!r}. "
+                         f"Use '~', 'entre' o uno de {list(OPERADORES_COMPARACION)}.")
+
+def _evaluar_condicion(condicion, pais):
+    """
+    Evalúa una condición (ya ordenada con _ordenar_condicion) sobre un país; all()/any() detienen
+    la evaluación en cuanto el resultado se conoce.
+    """
+    if _es_compuesta(condicion):
+        combinar = all if condicion[0] == "y" else any
+        return combinar(_evaluar_condicion(hija, pais) for hija in condicion[1:])
+    campo, operador_condicion, valor = condicion
+    if operador_condicion == "~":
+        return compilar_patron(valor).search(pais[campo]) is not None
+    if operador_condicion == "entre":
+        return valor[0] <= pais[campo] <= valor[1]
+    return OPERADORES_COMPARACION[operador_condicion](pais[campo], valor)
+
+def _mascara_condicion(condicion, tabla, activas):
+    """
+    Evalúa una condición (ya ordenada con _ordenar_condicion) sobre una TablaPaises y devuelve una máscara booleana.
     
-    return paises_estructurados
+    Solo se evalúan las filas marcadas en `activas`: en una conjunción, cada condición se aplica
+    únicamente a las filas que siguen cumpliendo las anteriores (y en una disyunción, a las que
+    aún no cumplen ninguna), y la evaluación se detiene si ya no quedan filas por decidir.
+    """
+    if _es_compuesta(condicion):
+        hijas = condicion[1:]
+        if condicion[0] == "y":
+            mascara = activas.copy()
+            for hija in hijas:
+                if not mascara.any():
+                    break
+                mascara &= _mascara_condicion(hija, tabla, mascara)
+            return mascara
+        mascara = np.zeros(len(tabla), dtype=bool)
+        for hija in hijas:
+            pendientes = activas & ~mascara
+            if not pendientes.any():
+                break
+            mascara |= _mascara_condicion(hija, tabla, pendientes)
+        return mascara
+    
+    campo, operador_condicion, valor = condicion
+    columna = tabla.columna(campo)
+    if operador_condicion == "~":
+        # Expresión regular: evaluar solo las filas activas de la columna de texto
+        regex = compilar_patron(valor)
+        mascara = np.zeros(len(tabla), dtype=bool)
+        posiciones = np.flatnonzero(activas)
+        mascara[posiciones] = [regex.search(texto) is not None for texto in columna[posiciones]]
+        return mascara
+    if operador_condicion == "entre":
+        return activas & (columna >= valor[0]) & (columna <= valor[1])
+    return activas & OPERADORES_COMPARACION[operador_condicion](columna, valor)
 
-def calcular_densidad(poblacion, area):
+def filtrar_paises(datos_estructurados, condicion):
     """
-    Calcula la densidad poblacional de un país (habitantes por km²).
+    Filtra países combinando condiciones sobre cualquier campo (no solo "Nombre").
     
-    Evita divisiones por cero y redondea el resultado a 2 decimales.
+    Una condición simple es una tupla (campo, operador, valor):
+        - ("Idiomas", "~", "Spanish"): el campo coincide con la expresión regular (sin distinguir mayúsculas).
+        - ("Población", ">", 10_000_000): comparación con "==", "!=", ">", ">=", "<" o "<=".
+          Los campos de texto solo admiten "==" y "!=" (con un texto); el orden requiere números.
+        - ("Área (km²)", "entre", (1_000, 50_000)): rango numérico inclusivo.
+    Las condiciones se combinan con ("y", cond1, cond2, ...) o ("o", cond1, cond2, ...), que pueden anidarse.
+    La evaluación se detiene en cuanto el resultado se conoce y, con una TablaPaises, se hace sobre las
+    columnas NumPy sin copiar filas.
     
     Args:
-        poblacion (int): Población total del país.
-        area (float): Área territorial del país en km².
+        datos_estructurados (list | TablaPaises): Países estructurados.
+        condicion (tuple): Condición simple o compuesta.
     
     Returns:
-        float: Densidad poblacional calculada o 0 si el área es inválida (<= 0).
+        list: Países que cumplen la condición (o subtabla si los datos son una TablaPaises).
+              Vacía si alguna expresión regular no es válida.
+    
+    Raises:
+        ValueError: Si la condición está mal formada, usa un campo u operador desconocido, o el operador
+                    no corresponde al tipo del campo o del valor (ej.: "~" sobre un número, ">" sobre texto).
+    
+    Ejemplo de uso:
+        filtrar_paises(datos_estructurados, ("y",
+            ("Región", "==", "Europe"),
+            ("o", ("Idiomas", "~", "German"), ("Población", ">", 10_000_000))
+        ))
     """
     try:
-        # Calcular densidad y redondear para mejorar legibilidad
-        return round(poblacion / area, 2) if area > 0 else 0
-    except ZeroDivisionError:
-        # Manejar explícitamente división por cero (aunque ya está cubierto por el condicional)
-        return 0
+        _validar_condicion(condicion, *_tipos_campos(datos_estructurados))
+    except re.error as e:
+        print(f"Error en la expresión regular: {e}")
+        return []
+    
+    condicion = _ordenar_condicion(condicion)
+    if isinstance(datos_estructurados, TablaPaises):
+        return datos_estructurados.seleccionar(
+            _mascara_condicion(condicion, datos_estructurados, np.ones(len(datos_estructurados), dtype=bool))
+        )
+    return [pais for pais in datos_estructurados if _evaluar_condicion(condicion, pais)]
 
 """
-modulo.py - Funciones adicionales para manejo de archivos y filtrado con expresiones regulares.
+modulo.py - Índice de nombres (trie de prefijos, trie de sufijos y trigramas) para filtrar sin recorrer todos los países.
 """
-def guardar_datos_json(datos, nombre_archivo="datos_paises.json"):
+METACARACTERES_REGEX = set(".^$*+?{}[]\\|()")
+# Escapes cuya longitud depende de lo que sigue (\xhh, \uhhhh, \Uhhhhhhhh, \N{nombre}, octales y referencias)
+ESCAPES_LONGITUD_VARIABLE = set("xuUN0123456789")
+CUANTIFICADOR_LLAVES = re.compile(r"\{\d*(?:,\d*)?\}")
+
+def _tokens_patron(patron):
     """
-    Guarda datos estructurados (lista de diccionarios) en un archivo JSON con formato legible.
+    Divide un patrón de expresión regular en tokens para el planificador de consultas.
     
-    Este método asegura que los caracteres no ASCII (ej.: tildes, símbolos) se conserven correctamente.
-    El archivo generado puede usarse para persistencia de datos, análisis posterior o compartir información estructurada.
+    Returns:
+        list: Tuplas (tipo, valor) con tipo "lit" (carácter literal), "^", "$" u "otro"
+              (clases, grupos, cuantificadores, escapes como \\d). Un literal seguido de un
+              cuantificador (?, *, {m,n}) se marca como "otro" porque deja de ser obligatorio.
+              Ante un escape de longitud variable (\\x41, \\u0041, \\N{...}, \\101, \\1) la
+              lista termina con "otro": los caracteres siguientes no se pueden interpretar con certeza.
+    """
+    tokens, i = [], 0
+    while i < len(patron):
+        caracter = patron[i]
+        if caracter == "\\" and i + 1 < len(patron):
+            siguiente = patron[i + 1]
+            if siguiente in ESCAPES_LONGITUD_VARIABLE:
+                # Códigos de carácter, octales y referencias: dejar de extraer literales
+                tokens.append(("otro", None))
+                break
+            # "\\." es un punto literal; "\\d", "\\b", "\\n", etc. son clases, anclas o caracteres especiales
+            tokens.append(("otro", None) if siguiente.isalnum() else ("lit", siguiente))
+            i += 2
+            continue
+        if caracter == "{" and (cuantificador := CUANTIFICADOR_LLAVES.match(patron, i)):
+            # "{m,n}" completo es un único cuantificador: el literal anterior deja de ser obligatorio
+            if tokens and tokens[-1][0] == "lit":
+                tokens[-1] = ("otro", None)
+            tokens.append(("otro", None))
+            i = cuantificador.end()
+            continue
+        if caracter == "[":
+            # Saltar la clase de caracteres completa (un "]" inicial forma parte de la clase)
+            fin = i + 1
+            if fin < len(patron) and patron[fin] == "^":
+                fin += 1
+            if fin < len(patron) and patron[fin] == "]":
+                fin += 1
+            while fin < len(patron) and patron[fin] != "]":
+                fin += 2 if patron[fin] == "\\" else 1
+            tokens.append(("otro", None))
+            i = fin + 1
+            continue
+        if caracter in "?*{" and tokens and tokens[-1][0] == "lit":
+            tokens[-1] = ("otro", None)
+        if caracter in ("^", "$"):
+            tokens.append((caracter, None))
+        elif caracter in METACARACTERES_REGEX:
+            tokens.append(("otro", None))
+        else:
+            tokens.append(("lit", caracter))
+        i += 1
+    return tokens
+
+def literales_patron(patron_regex):
+    """
+    Obtiene el texto literal de un patrón de expresión regular, sin anclas, clases, cuantificadores ni escapes.
+    
+    Sirve para pedir sugerencias a IndiceDifuso a partir del patrón que escribió el usuario: los
+    metacaracteres contarían como errores de escritura y formarían trigramas que ningún nombre tiene.
     
     Args:
-        datos (list): Lista de diccionarios con datos de países (ej.: [{"Nombre": "Colombia", ...}]). 
-        nombre_archivo (str): Nombre del archivo JSON de salida. Por defecto: "datos_paises.json".
+        patron_regex (str): Patrón de búsqueda (ej.: "^Argentna$").
     
     Returns:
-        None: La función no devuelve valores, pero imprime mensajes de éxito o error.
+        str: Caracteres literales del patrón, en orden (ej.: "Argentna"); "" si no tiene ninguno.
     
     Ejemplo de uso:
-        guardar_datos_json(datos_estructurados, "paises_filtrados.json")
+        IndiceDifuso.desde_datos(datos_estructurados).buscar(literales_patron("^Argentna$"))
+        # -> [("Argentina", 1)]
     """
-    try:
-        # Abrir el archivo en modo escritura ('w') con codificación UTF-8 para soportar caracteres especiales
-        with open(nombre_archivo, "w", encoding="utf-8") as f:
-            # Guardar datos en formato JSON con indentación para mejorar legibilidad
-            # ensure_ascii=False: Mantiene caracteres no ASCII (ej.: "España" en lugar de "Espa\\u00f1a")
-            json.dump(datos, f, indent=4, ensure_ascii=False)
-        
-        # Confirmación de guardado exitoso
-        print(f"Datos guardados en {nombre_archivo}")
-        
-    except Exception as e:
-        # Capturar errores comunes como permisos insuficientes o rutas inválidas
-        print(f"Error al guardar el archivo: {e}")
+    return "".join(valor for tipo, valor in _tokens_patron(patron_regex) if tipo == "lit")
 
-def filtrar_paises_con_regex(datos_estructurados, patron_regex):
+def _literal_inicial(tokens):
+    # Literales consecutivos desde el inicio de la lista de tokens
+    literal = []
+    for tipo, valor in tokens:
+        if tipo != "lit":
+            break
+        literal.append(valor)
+    return "".join(literal)
+
+class IndiceNombres:
     """
-    Filtra países cuyo nombre cumple con un patrón de expresión regular.
+    Índice de nombres de países construido una sola vez para responder filtros sin recorrer todos los datos.
     
-    Las expresiones regulares permiten búsquedas avanzadas (ej.: países que comienzan con "A", terminan en "land", etc.).
-    Se usa `re.IGNORECASE` para hacer la búsqueda insensible a mayúsculas/minúsculas.
+    Mantiene tres estructuras sobre los nombres en minúsculas:
+        - Trie de prefijos: resuelve patrones anclados al inicio ("^A") y el autocompletado.
+        - Trie de sufijos (nombres invertidos): resuelve patrones anclados al final ("land$").
+        - Índice de trigramas: resuelve subcadenas literales de 3 o más caracteres ("ana").
+    El planificador (ver `filtrar`) extrae del patrón los literales obligatorios, obtiene los
+    candidatos del índice y solo verifica con la expresión regular esos candidatos. Los patrones
+    que no se pueden planificar (ej.: con "|") se evalúan recorriendo todos los nombres, por lo
+    que el resultado siempre coincide con filtrar_paises_con_regex.
     
     Args:
-        datos_estructurados (list): Lista de diccionarios con datos de países. 
-        patron_regex (str): Patrón de expresión regular válido (ej.: "^A" para nombres que empiezan con A).
-    
-    Returns:
-        list: Lista de países que coinciden con el patrón. Vacía si hay errores o no hay coincidencias.
+        datos_estructurados (list | TablaPaises): Países estructurados a indexar.
     
-    Ejemplos de patrones útiles:
-        - "^A": Países que comienzan con "A" (ej.: Argentina, Alemania).
-        - "land$": Países que terminan con "land" (ej.: Finlandia, Islandia).
-        - "[0-9]": Países con números en su nombre (ej.: 3 de Mayo en Colombia).
+    Ejemplo de uso:
+        indice = IndiceNombres(datos_estructurados)
+        indice.filtrar("land$")
+        indice.autocompletar("ar")  # -> ["Argentina", "Armenia", "Aruba"]
     """
-    try:
-        # Compilar el patrón de expresión regular con bandera para ignorar mayúsculas/minúsculas
-        regex = re.compile(patron_regex, re.IGNORECASE)
+    def __init__(self, datos_estructurados):
+        self.datos = datos_estructurados
+        self.nombres = [pais["Nombre"] for pais in datos_estructurados]
+        self._minusculas = [nombre.lower() for nombre in self.nombres]
+        self._prefijos = {}
+        self._sufijos = {}
+        self._trigramas = {}
+        for posicion, nombre in enumerate(self._minusculas):
+            self._insertar(self._prefijos, nombre, posicion)
+            self._insertar(self._sufijos, nombre[::-1], posicion)
+            for inicio in range(len(nombre) - 2):
+                self._trigramas.setdefault(nombre[inicio:inicio + 3], set()).add(posicion)
+    
+    @staticmethod
+    def _insertar(trie, texto, posicion):
+        # Cada nodo guarda (clave None) las posiciones de todos los nombres que pasan por él
+        nodo = trie
+        nodo.setdefault(None, []).append(posicion)
+        for caracter in texto:
+            nodo = nodo.setdefault(caracter, {})
+            nodo.setdefault(None, []).append(posicion)
+    
+    @staticmethod
+    def _buscar(trie, texto):
+        nodo = trie
+        for caracter in texto:
+            if (nodo := nodo.get(caracter)) is None:
+                return []
+        return nodo.get(None, [])
+    
+    def posiciones_prefijo(self, prefijo):
+        """Posiciones (en orden de los datos) de los nombres que empiezan con `prefijo` (sin distinguir mayúsculas)."""
+        return self._buscar(self._prefijos, prefijo.lower())
+    
+    def posiciones_sufijo(self, sufijo):
+        """Posiciones de los nombres que terminan con `sufijo` (sin distinguir mayúsculas)."""
+        return sorted(self._buscar(self._sufijos, sufijo.lower()[::-1]))
+    
+    def posiciones_subcadena(self, texto):
+        """Posiciones de los nombres que contienen `texto` (sin distinguir mayúsculas)."""
+        texto = texto.lower()
+        if len(texto) < 3:
+            # Subcadenas cortas: no hay trigramas, se comparan directamente
+            return [posicion for posicion, nombre in enumerate(self._minusculas) if texto in nombre]
+        candidatos = set.intersection(*(
+            self._trigramas.get(texto[inicio:inicio + 3], set()) for inicio in range(len(texto) - 2)
+        ))
+        return sorted(posicion for posicion in candidatos if texto in self._minusculas[posicion])
+    
+    def autocompletar(self, prefijo, limite=10):
+        """
+        Devuelve hasta `limite` nombres que empiezan con `prefijo`, ordenados alfabéticamente.
+        """
+        return sorted(self.nombres[posicion] for posicion in self.posiciones_prefijo(prefijo))[:limite]
+    
+    def _candidatos(self, patron):
+        """
+        Planificador de consultas: posiciones candidatas para un patrón, o None si debe recorrerse todo.
+        """
+        if "|" in patron or patron.startswith("(?"):
+            # Alternativas o banderas en línea: ningún literal es obligatorio con certeza
+            return None
+        tokens = _tokens_patron(patron)
+        conjuntos = []
         
-        # Usar comprensión de listas para filtrar países cuyo nombre cumple el patrón
-        return [pais for pais in datos_estructurados if regex.search(pais["Nombre"])]
+        if tokens and tokens[0][0] == "^" and (prefijo := _literal_inicial(tokens[1:])):
+            conjuntos.append(set(self.posiciones_prefijo(prefijo)))
+        if tokens and tokens[-1][0] == "$" and (sufijo := _literal_inicial(tokens[-2::-1])[::-1]):
+            conjuntos.append(set(self.posiciones_sufijo(sufijo)))
+        if not conjuntos and "(" not in patron:
+            # Sin grupos, cualquier tramo literal es obligatorio: usar el más largo con los trigramas
+            tramos = ["".join(valor for _, valor in grupo)
+                      for es_literal, grupo in itertools.groupby(tokens, key=lambda token: token[0] == "lit")
+                      if es_literal]
+            if len(tramo := max(tramos, key=len, default="")) >= 3:
+                conjuntos.append(set(self.posiciones_subcadena(tramo)))
+        
+        return sorted(set.intersection(*conjuntos)) if conjuntos else None
     
-    except re.error as e:
-        # Manejar errores de sintaxis en el patrón de regex (ej.: patrón inválido)
-        print(f"Error en la expresión regular: {e}")
-        return []
+    def filtrar(self, patron_regex):
+        """
+        Equivalente a filtrar_paises_con_regex sobre los datos indexados, usando el índice cuando es posible.
+        
+        Returns:
+            list | TablaPaises: Países que coinciden, en el orden original. Vacío si el patrón no es válido.
+        """
+        try:
+            regex = compilar_patron(patron_regex)
+        except re.error as e:
+            print(f"Error en la expresión regular: {e}")
+            return []
+        
+        candidatos = self._candidatos(patron_regex)
+        if candidatos is None:
+            candidatos = range(len(self.nombres))
+        # Verificación residual con la expresión regular, solo sobre los candidatos
+        posiciones = [posicion for posicion in candidatos if regex.search(self.nombres[posicion])]
+        
+        if isinstance(self.datos, TablaPaises):
+            return self.datos.seleccionar(np.array(posiciones, dtype=np.intp))
+        return [self.datos[posicion] for posicion in posiciones]
 
 """
 modulo.py - Funciones adicionales para análisis estadístico de datos de países.
 """
+class AcumuladorEstadisticas:
+    """
+    Acumulador de estadísticas descriptivas que se alimenta fila a fila en una sola pasada.
+    
+    Media y varianza se actualizan con el algoritmo de Welford (numéricamente estable, sin guardar
+    los valores); moda y mediana exacta se obtienen de un contador de valores distintos. Dos
+    acumuladores del mismo campo pueden combinarse con `combinar`, lo que permite procesar
+    particiones por separado (ej.: por región o por archivo) y unir los resultados.
+    
+    Implementa la interfaz de sumidero (agregar/cerrar), por lo que puede usarse en ejecutar_pipeline.
+    
+    Precisión: mediana y moda son exactas (iguales a statistics.median y statistics.mode), al igual
+    que la suma de valores enteros. Media y varianza se calculan en coma flotante y dependen del orden
+    en que llegan los valores (fila a fila, por lotes de NumPy en una TablaPaises o combinando
+    particiones), así que pueden diferir de statistics.mean/variance, y entre sí, en los últimos
+    dígitos: el error relativo es menor que 1e-12 (del orden de 1e-15 con los datos de la API).
+    
+    Args:
+        campo (str): Campo numérico a analizar (ej.: "Población"). Solo se cuentan valores > 0,
+                     igual que en analizar_estadisticas.
+    
+    Ejemplo de uso:
+        acumulador = AcumuladorEstadisticas("Población")
+        for pais in datos_estructurados:
+            acumulador.agregar(pais)
+        acumulador.resultado()  # -> {"Campo": "Población", "Media": ..., ...}
+    """
+    def __init__(self, campo="Población"):
+        self.campo = campo
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0  # Suma de cuadrados de las diferencias respecto a la media
+        self.suma = 0
+        self.frecuencias = Counter()
+    
+    def agregar(self, fila):
+        """Incorpora el valor del campo de una fila (diccionario de país), ignorando valores <= 0."""
+        if (valor := fila.get(self.campo, 0)) > 0:
+            self.agregar_valor(valor)
+    
+    def agregar_valor(self, valor):
+        """Incorpora un valor numérico con la actualización de Welford."""
+        self.n += 1
+        self.suma += valor
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        self.frecuencias[valor] += 1
+    
+    def agregar_valores(self, valores):
+        """
+        Incorpora un lote de valores (ej.: una columna NumPy) calculando sus momentos de forma vectorizada.
+        
+        Los valores <= 0 se ignoran, igual que en agregar.
+        """
+        valores = np.asarray(valores)
+        valores = valores[valores > 0]
+        if not len(valores):
+            return
+        lote = AcumuladorEstadisticas(self.campo)
+        lote.n = len(valores)
+        lote.media = float(valores.mean())
+        lote.m2 = float(((valores - lote.media) ** 2).sum())
+        lote.suma = valores.sum().item()
+        lote.frecuencias = Counter(valores.tolist())
+        self.combinar(lote)
+    
+    def combinar(self, otro):
+        """
+        Une otro acumulador del mismo campo a este (fórmula de Chan et al. para media y varianza).
+        
+        Returns:
+            AcumuladorEstadisticas: Este mismo acumulador, para permitir encadenar llamadas.
+        """
+        if otro.n:
+            total = self.n + otro.n
+            delta = otro.media - self.media
+            self.media += delta * otro.n / total
+            self.m2 += otro.m2 + delta * delta * self.n * otro.n / total
+            self.n = total
+            self.suma += otro.suma
+            self.frecuencias.update(otro.frecuencias)
+        return self
+    
+    def mediana(self):
+        """Mediana exacta calculada recorriendo los valores distintos en orden."""
+        if not self.n:
+            raise statistics.StatisticsError("no median for empty data")
+        posiciones = sorted({(self.n - 1) // 2, self.n // 2})
+        encontrados, acumulado = [], 0
+        for valor in sorted(self.frecuencias):
+            acumulado += self.frecuencias[valor]
+            while posiciones and acumulado > posiciones[0]:
+                encontrados.append(valor)
+                posiciones.pop(0)
+            if not posiciones:
+                break
+        # Con cantidad par de datos se promedian los dos valores centrales (como statistics.median)
+        return encontrados[0] if len(encontrados) == 1 else (encontrados[0] + encontrados[1]) / 2
+    
+    def moda(self):
+        """Valor más frecuente; ante empates, el primero en aparecer (como statistics.mode)."""
+        if not self.n:
+            raise statistics.StatisticsError("no mode for empty data")
+        return self.frecuencias.most_common(1)[0][0]
+    
+    def varianza(self):
+        """Varianza muestral (divisor n - 1)."""
+        if self.n < 2:
+            raise statistics.StatisticsError("variance requires at least two data points")
+        return self.m2 / (self.n - 1)
+    
+    def resultado(self):
+        """
+        Devuelve las estadísticas con el mismo formato que analizar_estadisticas.
+        
+        Raises:
+            statistics.StatisticsError: Si no hay datos suficientes (se requieren al menos dos valores).
+        """
+        varianza = self.varianza()
+        return {
+            "Campo": self.campo,
+            "Media": round(self.media, 2),
+            "Mediana": self.mediana(),
+            "Moda": self.moda(),
+            "Varianza": round(varianza, 2),
+            "Desviación Estándar": round(math.sqrt(varianza), 2)
+        }
+    
+    def cerrar(self):
+        return self.resultado()
+    
+    def descartar(self):
+        # No hay recursos que liberar
+        pass
+
 def analizar_estadisticas(datos_estructurados, campo="Población"):
     """
     Calcula y organiza estadísticas descriptivas para un campo numérico específico en una lista de diccionarios.
@@ -215,8 +2716,10 @@ def analizar_estadisticas(datos_estructurados, campo="Población"):
     de los datos estructurados de países, proporcionando métricas clave para interpretación geográfica/demográfica.
     
     Args:
-        datos_estructurados (list): Lista de diccionarios con datos de países (ej.: [{"Nombre": "Colombia", "Población": 50_882_891, ...}]). 
-        campo (str): Nombre del campo numérico a analizar. Por defecto: "Población".
+        datos_estructurados (list | TablaPaises): Lista de diccionarios con datos de países (ej.: [{"Nombre": "Colombia", "Población": 50_882_891, ...}]) o tabla columnar. 
+        campo (str | list): Nombre del campo numérico a analizar. Por defecto: "Población".
+                            También acepta una lista de campos o "todos" (todas las columnas numéricas);
+                            en ese caso todos se calculan en un único recorrido de los datos.
     
     Returns:
         dict: Diccionario con las siguientes estadísticas:
@@ -226,7 +2729,8 @@ def analizar_estadisticas(datos_estructurados, campo="Población"):
             - Moda: Valor más frecuente.
             - Varianza: Dispersión de los valores respecto a la media.
             - Desviación Estándar: Variabilidad promedio de los valores.
-        None: Si no hay datos válidos o el campo no es numérico.
+        None: Si no hay datos válidos o el campo no existe o no es numérico (igual con lista o TablaPaises).
+        dict: Si se piden varios campos, diccionario campo -> estadísticas (o None) de cada uno.
     
     Ejemplo de retorno exitoso:
         {
@@ -238,39 +2742,57 @@ def analizar_estadisticas(datos_estructurados, campo="Población"):
             "Desviación Estándar": 111877480.37
         }
     """
-    # Extraer valores del campo especificado, filtrando valores <= 0 (ej.: países sin dato disponible)
-    valores = [pais[campo] for pais in datos_estructurados if pais.get(campo, 0) > 0]
+    # Varios campos: lista/tupla de nombres o "todos" para cada columna numérica del esquema
+    if campo == "todos":
+        varios_campos, campos = True, tuple(TIPOS_COLUMNAS_NUMERICAS)
+    elif isinstance(campo, str):
+        varios_campos, campos = False, (campo,)
+    else:
+        varios_campos, campos = True, tuple(campo)
+    
+    # Validar los campos antes de recorrer los datos: una lista y una TablaPaises responden igual a un
+    # campo inexistente o de texto (mensaje en consola y None) en lugar de lanzar KeyError o TypeError
+    tipos, estricto = _tipos_campos(datos_estructurados)
+    resultados = {}
+    for nombre in campos:
+        if nombre not in tipos and estricto:
+            print(f"El campo '{nombre}' no existe en los datos.")
+            resultados[nombre] = None
+        elif tipos.get(nombre) == "texto":
+            print(f"El campo '{nombre}' no es numérico.")
+            resultados[nombre] = None
+    
+    # Acumular en una sola pasada, ignorando valores <= 0 (ej.: países sin dato disponible)
+    acumuladores = {nombre: AcumuladorEstadisticas(nombre) for nombre in campos if nombre not in resultados}
+    if isinstance(datos_estructurados, TablaPaises):
+        # Tabla columnar: procesar cada columna completa como un lote vectorizado
+        for nombre, acumulador in acumuladores.items():
+            acumulador.agregar_valores(datos_estructurados.columna(nombre))
+    else:
+        # Un único recorrido de la lista alimenta a todos los acumuladores
+        for pais in datos_estructurados:
+            for acumulador in acumuladores.values():
+                acumulador.agregar(pais)
+    
+    resultados.update({nombre: _resultado_estadisticas(acumulador) for nombre, acumulador in acumuladores.items()})
+    return {nombre: resultados[nombre] for nombre in campos} if varios_campos else resultados[campo]
+
+def _resultado_estadisticas(acumulador):
+    """
+    Obtiene el diccionario de estadísticas de un acumulador, informando en consola si no es posible.
     
-    if not valores:
-        print(f"No hay datos válidos en el campo '{campo}'.")
+    Returns:
+        dict: Estadísticas con el formato de analizar_estadisticas.
+        None: Si no hay datos válidos o no alcanzan para calcular las estadísticas.
+    """
+    if not acumulador.n:
+        print(f"No hay datos válidos en el campo '{acumulador.campo}'.")
         return None
 
     try:
-        # Calcular estadísticas básicas usando el módulo statistics
-        # Media: Promedio aritmético de los valores
-        media = round(statistics.mean(valores), 2)
-        
-        # Mediana: Valor que divide los datos ordenados en dos partes iguales
-        mediana = statistics.median(valores)
-        
-        # Moda: Valor que aparece con mayor frecuencia
-        moda = statistics.mode(valores)
-        
-        # Varianza: Promedio del cuadrado de las diferencias respecto a la media (mide dispersión)
-        varianza = round(statistics.variance(valores), 2)
-        
-        # Desviación estándar: Raíz cuadrada de la varianza (más interpretable que la varianza)
-        desviacion_std = round(statistics.stdev(valores), 2)
-        
-        # Devolver estadísticas en un diccionario estructurado
-        return {
-            "Campo": campo,
-            "Media": media,
-            "Mediana": mediana,
-            "Moda": moda,
-            "Varianza": varianza,
-            "Desviación Estándar": desviacion_std
-        }
+        # Media y varianza (Welford), mediana y moda (contador de valores) en un solo recorrido;
+        # la desviación estándar es la raíz cuadrada de la varianza
+        return acumulador.resultado()
     
     except statistics.StatisticsError as e:
         # Manejar errores comunes en cálculos estadísticos:
@@ -279,18 +2801,130 @@ def analizar_estadisticas(datos_estructurados, campo="Población"):
         return None
 
 """
-modulo.py - Funciones adicionales para exportar datos estructurados a Excel usando pandas.
+modulo.py - Agregaciones por grupo (región, subregión, idioma, moneda) en una sola pasada.
+"""
+# Columnas que contienen varios valores separados por ", " (un país pertenece a varios grupos)
+COLUMNAS_MULTIVALOR = ("Idiomas", "Monedas")
+CAMPOS_AGREGACION = ("Población", "Área (km²)", "Densidad (hab/km²)")
+
+def _claves_grupo(pais, por):
+    # Región/Subregión dan una sola clave; Idiomas/Monedas una por cada valor de la lista
+    valor = pais[por]
+    return valor.split(", ") if por in COLUMNAS_MULTIVALOR else (valor,)
+
+def agrupar_estadisticas(datos_estructurados, por="Región", campos=CAMPOS_AGREGACION):
+    """
+    Calcula estadísticas por grupo (ej.: por región) recorriendo los datos una sola vez.
+    
+    Cada país se asigna a su grupo mediante un diccionario (partición por hash) que mantiene un
+    AcumuladorEstadisticas por grupo y campo. Con "Idiomas" o "Monedas" un país cuenta en cada uno
+    de sus idiomas o monedas. Al igual que en analizar_estadisticas, los valores <= 0 se ignoran.
+    
+    Args:
+        datos_estructurados (list | TablaPaises): Países estructurados.
+        por (str): Columna de agrupación: "Región", "Subregión", "Idiomas" o "Monedas". Por defecto: "Región".
+        campos (iterable): Campos numéricos a agregar. Por defecto: población, área y densidad.
+    
+    Returns:
+        dict: Grupo -> resumen, ordenado por nombre de grupo. Cada resumen contiene:
+            - Países: Cantidad de países del grupo.
+            - <campo>: {"Suma", "Media", "Mediana", "Varianza"} para cada campo (None si no aplica).
+            - Densidad Agregada (hab/km²): Población total / área total del grupo, es decir, la
+              media de densidad ponderada por área. Ambas sumas cubren los mismos países: los que
+              tienen área > 0 (un territorio sin área no aporta población al numerador).
+    
+    Ejemplo de uso:
+        por_region = agrupar_estadisticas(datos_estructurados, por="Región")
+        por_region["Europe"]["Población"]["Media"]
+    """
+    campos = tuple(campos)
+    conteos = Counter()
+    acumuladores = {}
+    # Densidad ponderada: requiere población y área entre los campos agregados. La población se suma
+    # aparte, solo para los países con área > 0, que son los que cuentan en la suma de áreas
+    con_densidad = "Población" in campos and "Área (km²)" in campos
+    poblacion_con_area = Counter()
+    
+    def acumuladores_de(grupo):
+        if grupo not in acumuladores:
+            acumuladores[grupo] = {campo: AcumuladorEstadisticas(campo) for campo in campos}
+        return acumuladores[grupo]
+    
+    if isinstance(datos_estructurados, TablaPaises) and por in COLUMNAS_CATEGORICAS:
+        # Tabla columnar: ordenar una vez por código de grupo y procesar cada tramo como un lote
+        codigos, categorias = datos_estructurados.codigos(por)
+        orden = np.argsort(codigos, kind="stable")
+        limites = np.flatnonzero(np.diff(codigos[orden])) + 1
+        for campo in campos:
+            columna = datos_estructurados.columna(campo)[orden]
+            for tramo, valores in zip(np.split(orden, limites), np.split(columna, limites)):
+                if len(tramo):
+                    acumuladores_de(categorias[codigos[tramo[0]]])[campo].agregar_valores(valores)
+        conteos.update({categorias[codigo]: cantidad for codigo, cantidad in
+                        zip(*np.unique(codigos, return_counts=True))})
+        if con_densidad:
+            poblaciones = datos_estructurados.columna("Población")
+            mascara = (datos_estructurados.columna("Área (km²)") > 0) & (poblaciones > 0)
+            sumas = np.zeros(len(categorias), dtype=np.int64)
+            np.add.at(sumas, codigos[mascara], poblaciones[mascara])
+            poblacion_con_area.update({categorias[codigo]: suma for codigo, suma in enumerate(sumas.tolist()) if suma})
+    else:
+        for pais in datos_estructurados:
+            con_area = con_densidad and pais.get("Área (km²)", 0) > 0 and pais.get("Población", 0) > 0
+            for grupo in _claves_grupo(pais, por):
+                conteos[grupo] += 1
+                for acumulador in acumuladores_de(grupo).values():
+                    acumulador.agregar(pais)
+                if con_area:
+                    poblacion_con_area[grupo] += pais["Población"]
+    
+    resultados = {}
+    for grupo in sorted(conteos):
+        resumen = {"Países": int(conteos[grupo])}
+        for campo, acumulador in acumuladores_de(grupo).items():
+            resumen[campo] = {
+                "Suma": acumulador.suma,
+                "Media": round(acumulador.media, 2),
+                "Mediana": acumulador.mediana(),
+                "Varianza": round(acumulador.varianza(), 2) if acumulador.n > 1 else None,
+            } if acumulador.n else None
+        
+        if con_densidad:
+            resumen["Densidad Agregada (hab/km²)"] = calcular_densidad(poblacion_con_area[grupo],
+                                                                      acumuladores[grupo]["Área (km²)"].suma)
+        resultados[grupo] = resumen
+    return resultados
+
+"""
+modulo.py - Funciones adicionales para exportar datos estructurados a Excel (openpyxl, o pandas si se pide).
 """
-def exportar_datos_excel(datos, nombre_archivo="datos_paises.xlsx"):
+# Filas y ancho máximo de celda de la vista previa que muestra exportar_datos_excel
+FILAS_VISTA_PREVIA = 5
+ANCHO_CELDA_VISTA_PREVIA = 20
+
+def _vista_previa(filas, campos):
+    # Tabla de texto con columnas alineadas, similar a DataFrame.head(), sin necesidad de pandas
+    def recortar(valor):
+        texto = str(valor)
+        return texto if len(texto) <= ANCHO_CELDA_VISTA_PREVIA else texto[:ANCHO_CELDA_VISTA_PREVIA - 3] + "..."
+    tabla = [[""] + [recortar(campo) for campo in campos]]
+    tabla += [[str(indice)] + [recortar(fila.get(campo)) for campo in campos] for indice, fila in enumerate(filas)]
+    anchos = [max(len(renglon[posicion]) for renglon in tabla) for posicion in range(len(tabla[0]))]
+    return "\n".join("  ".join(celda.rjust(ancho) for celda, ancho in zip(renglon, anchos)) for renglon in tabla)
+
+def exportar_datos_excel(datos, nombre_archivo="datos_paises.xlsx", usar_pandas=False):
     """
     Exporta una lista de diccionarios a un archivo Excel (.xlsx) y muestra una vista previa en consola.
     
-    Este método convierte los datos estructurados (ej.: países con campos como nombre, población, región)
-    en un DataFrame de pandas, lo que permite generar archivos Excel con formato tabular limpio y legible.
+    Este método escribe los datos estructurados (ej.: países con campos como nombre, población, región)
+    directamente en un libro de openpyxl, fila a fila, con el mismo formato tabular que generaba pandas
+    (encabezado en negrita, sin columna de índice); la escritura la hace exportar_datos_excel_streaming. Construir un DataFrame solo para exportarlo cuesta
+    tiempo y memoria, así que pandas se usa únicamente si se solicita con `usar_pandas=True`.
     
     Args:
         datos (list): Lista de diccionarios con datos de países (ej.: [{"Nombre": "Colombia", "Población": 50_882_891, ...}]). 
         nombre_archivo (str): Nombre del archivo Excel de salida. Por defecto: "datos_paises.xlsx".
+        usar_pandas (bool): Si es True, exporta mediante pandas.DataFrame.to_excel. Por defecto: False.
     
     Returns:
         None: La función no devuelve valores, pero imprime mensajes de éxito o error.
@@ -301,29 +2935,393 @@ def exportar_datos_excel(datos, nombre_archivo="datos_paises.xlsx"):
         | Colombia    | 50882891  | 1141748    | 44.56               | América | Sudamérica    | Español         | COP (Peso colombiano)  |
         | ...         | ...       | ...        | ...                 | ...     | ...           | ...             | ...                    |
     """
+    if usar_pandas:
+        _exportar_datos_excel_pandas(datos, nombre_archivo)
+        return
+    
     try:
-        # Convertir la lista de diccionarios a un DataFrame de pandas
-        # Un DataFrame es una estructura tabular ideal para análisis y exportación a Excel
-        df = pd.DataFrame(datos)
+        # Separar las primeras filas para la vista previa sin recorrer los datos dos veces
+        campos, filas = _campos_y_filas(datos)
+        primeras = list(itertools.islice(filas, FILAS_VISTA_PREVIA))
         
         # Mostrar una vista previa de los datos que se exportarán (primeras 5 filas)
         # Esto permite verificar que los campos estén correctamente estructurados antes de guardar
         print(f"\nMostrando las primeras filas que se exportarán a {nombre_archivo}:")
+        print(_vista_previa(primeras, campos))
+    
+    except Exception as e:
+        print(f"Error al exportar a Excel: {e}")
+        return
+    
+    # Escribir encabezado y filas directamente en el libro; los errores (ej.: openpyxl no instalada o
+    # valores que Excel no admite) se informan en consola
+    exportar_datos_excel_streaming(itertools.chain(primeras, filas), nombre_archivo, campos=campos)
+
+def _exportar_datos_excel_pandas(datos, nombre_archivo):
+    try:
+        # Importación diferida: pandas solo se carga cuando se pide explícitamente
+        import pandas as pd
+        
+        # Convertir la lista de diccionarios a un DataFrame de pandas
+        df = pd.DataFrame(datos.a_columnas() if isinstance(datos, TablaPaises) else datos)
+        print(f"\nMostrando las primeras filas que se exportarán a {nombre_archivo}:")
         print(df.head())
         
-        # Guardar el DataFrame en un archivo Excel (.xlsx)
         # Parámetros clave:
         # - index=False: Evita guardar el índice numérico por defecto de pandas
         # - engine="openpyxl": Especifica el motor para trabajar con archivos .xlsx modernos
-        df.to_excel(nombre_archivo, index=False, engine="openpyxl")
+        with ArchivoAtomico(nombre_archivo, "wb") as f:
+            df.to_excel(f.archivo, index=False, engine="openpyxl")
         print(f"Datos exportados exitosamente a {nombre_archivo}")
     
     except Exception as e:
-        # Manejar errores comunes:
-        # - Falta de bibliotecas (pandas, openpyxl no instaladas)
-        # - Datos con tipos no compatibles (ej.: objetos complejos en lugar de valores atómicos)
         print(f"Error al exportar a Excel: {e}")
 
+def _campos_y_filas(filas, campos=None):
+    # Toma las columnas de la primera fila sin consumirla (o las de ESQUEMA_PAISES si no hay filas)
+    filas = iter(filas)
+    primera = next(filas, None)
+    if primera is None:
+        return list(campos or (columna for columna, _, _ in ESQUEMA_PAISES)), iter(())
+    return list(campos or primera), itertools.chain((primera,), filas)
+
+class EscritorExcel:
+    """
+    Libro Excel que se escribe fila a fila con el modo de solo escritura de openpyxl.
+    
+    A diferencia de exportar_datos_excel, no construye un DataFrame ni mantiene el libro completo
+    en memoria: cada fila se vuelca a un archivo temporal de openpyxl en cuanto se agrega, por lo
+    que exportar cientos de miles de filas usa memoria constante. Admite varias hojas, que pueden
+    recibir filas en cualquier orden. El archivo final se publica de forma atómica al cerrar.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .xlsx de salida.
+    
+    Ejemplo de uso:
+        libro = EscritorExcel("datos_paises.xlsx")
+        libro.agregar_hoja("Países", ["Nombre", "Población"])
+        for pais in iterar_paises_estructurados(iterar_datos_paises()):
+            libro.agregar("Países", pais)
+        libro.cerrar()
+    """
+    def __init__(self, nombre_archivo):
+        # Importación diferida: openpyxl solo se necesita al exportar a Excel
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        
+        self.nombre_archivo = nombre_archivo
+        self.libro = Workbook(write_only=True)
+        self.hojas = {}
+        self._celda = WriteOnlyCell
+        self._fuente_encabezado = Font(bold=True)
+    
+    def agregar_hoja(self, nombre, campos):
+        """
+        Crea una hoja con una fila de encabezado (en negrita) con los nombres de las columnas.
+        
+        Excel no admite los caracteres []:*?/\\ en los nombres de hoja ni más de 31 caracteres;
+        se sustituyen por "_" y se recortan.
+        """
+        hoja = self.libro.create_sheet(re.sub(r"[\[\]:*?/\\]", "_", str(nombre))[:31])
+        encabezado = []
+        for campo in campos:
+            celda = self._celda(hoja, value=campo)
+            celda.font = self._fuente_encabezado
+            encabezado.append(celda)
+        hoja.append(encabezado)
+        self.hojas[nombre] = [hoja, tuple(campos), 0]
+    
+    def agregar(self, nombre_hoja, fila):
+        """Escribe una fila (diccionario o FilaPais) en la hoja indicada; los campos ausentes quedan vacíos."""
+        registro = self.hojas[nombre_hoja]
+        registro[0].append([fila.get(campo) for campo in registro[1]])
+        registro[2] += 1
+    
+    def cerrar(self):
+        """
+        Guarda el libro y devuelve un diccionario hoja -> cantidad de filas escritas (sin encabezado).
+        """
+        if not self.hojas:
+            # openpyxl no puede guardar un libro sin hojas
+            self.libro.create_sheet("Sheet1")
+        with ArchivoAtomico(self.nombre_archivo, "wb") as f:
+            self.libro.save(f.archivo)
+        return {nombre: registro[2] for nombre, registro in self.hojas.items()}
+    
+    def descartar(self):
+        """
+        Abandona el libro sin escribir el archivo destino y borra los temporales de sus hojas.
+        
+        openpyxl solo elimina esos temporales al terminar el proceso; además, si las hojas quedan a
+        medio escribir, al recolectarlas imprime "Exception ignored in WriteOnlyWorksheet._write_rows".
+        """
+        for hoja in (self.libro.worksheets if self.libro is not None else ()):
+            escritor = hoja._writer
+            try:
+                # Cerrar primero el generador de filas y después el de la hoja, como hace openpyxl al guardar
+                if hoja._rows is not None:
+                    hoja._rows.close()
+                if escritor is not None:
+                    escritor.close()
+            except Exception:
+                pass
+            if escritor is not None:
+                try:
+                    os.remove(escritor.out)
+                except OSError:
+                    pass
+        self.libro = None
+        self.hojas = {}
+
+def exportar_datos_excel_streaming(filas, nombre_archivo="datos_paises.xlsx", campos=None, nombre_hoja="Sheet1"):
+    """
+    Exporta países a Excel escribiendo las filas a medida que se recorren (memoria constante).
+    
+    Produce la misma tabla que exportar_datos_excel (encabezado con los nombres de las columnas y
+    una fila por país), pero acepta cualquier iterable, incluidos generadores como
+    iterar_paises_estructurados, y empieza a escribir desde la primera fila sin pasar por pandas.
+    
+    Args:
+        filas (iterable): Países estructurados (lista, TablaPaises o generador).
+        nombre_archivo (str): Nombre del archivo Excel de salida. Por defecto: "datos_paises.xlsx".
+        campos (iterable): Columnas a exportar. Por defecto: las claves de la primera fila.
+        nombre_hoja (str): Nombre de la hoja. Por defecto: "Sheet1" (igual que pandas).
+    
+    Returns:
+        int: Cantidad de filas exportadas.
+        None: Si ocurre un error (el mensaje se imprime en consola).
+    
+    Ejemplo de uso:
+        exportar_datos_excel_streaming(iterar_paises_estructurados(iterar_datos_paises()), "datos_paises.xlsx")
+    """
+    try:
+        campos, filas = _campos_y_filas(filas, campos)
+        libro = EscritorExcel(nombre_archivo)
+        libro.agregar_hoja(nombre_hoja, campos)
+        for fila in filas:
+            libro.agregar(nombre_hoja, fila)
+        total = libro.cerrar()[nombre_hoja]
+        print(f"Datos exportados exitosamente a {nombre_archivo} ({total} filas)")
+        return total
+    
+    except Exception as e:
+        print(f"Error al exportar a Excel: {e}")
+        return None
+
+def exportar_libro_excel(datos, nombre_archivo="datos_paises.xlsx", hojas_adicionales=None, por_region=True,
+                         campos_estadisticas=CAMPOS_AGREGACION):
+    """
+    Exporta en un único libro Excel todos los países, otros conjuntos de datos, una hoja por región
+    y un resumen estadístico, recorriendo los datos una sola vez.
+    
+    Sustituye a varias llamadas a exportar_datos_excel (un archivo por conjunto de datos): cada país
+    se escribe en la hoja "Países" y en la de su región, y a la vez se acumulan sus estadísticas,
+    de modo que el libro completo se genera en una pasada y con un único archivo comprimido.
+    
+    Args:
+        datos (iterable): Países estructurados (lista, TablaPaises o generador).
+        nombre_archivo (str): Nombre del archivo Excel de salida. Por defecto: "datos_paises.xlsx".
+        hojas_adicionales (dict): Nombre de hoja -> filas (ej.: {"Filtrados": paises_filtrados}). Opcional.
+        por_region (bool): Si es True, añade una hoja por cada valor de "Región". Por defecto: True.
+        campos_estadisticas (iterable): Campos numéricos del resumen de la hoja "Estadísticas".
+                                        Por defecto: población, área y densidad.
+    
+    Returns:
+        dict: Nombre de hoja -> cantidad de filas escritas.
+        None: Si ocurre un error (el mensaje se imprime en consola).
+    
+    Ejemplo de uso:
+        exportar_libro_excel(datos_estructurados, "datos_paises.xlsx", hojas_adicionales={"Filtrados": paises_filtrados})
+        # Hojas: Países, Filtrados, Estadísticas, Africa, Americas, Asia, Europe, Oceania, ...
+    """
+    try:
+        datos = iter(datos)
+        primera = next(datos, None)
+        campos = list(primera) if primera is not None else [columna for columna, _, _ in ESQUEMA_PAISES]
+        acumuladores = [AcumuladorEstadisticas(campo) for campo in campos_estadisticas]
+        
+        # Las hojas se crean en el orden en que aparecerán en el libro; las de región, al aparecer cada región
+        libro = EscritorExcel(nombre_archivo)
+        libro.agregar_hoja("Países", campos)
+        for nombre, filas in (hojas_adicionales or {}).items():
+            filas = iter(filas)
+            primera_adicional = next(filas, None)
+            libro.agregar_hoja(nombre, list(primera_adicional) if primera_adicional is not None else campos)
+            for fila in itertools.chain(() if primera_adicional is None else (primera_adicional,), filas):
+                libro.agregar(nombre, fila)
+        libro.agregar_hoja("Estadísticas", ("Campo", "Media", "Mediana", "Moda", "Varianza", "Desviación Estándar"))
+        
+        if primera is not None:
+            for pais in itertools.chain((primera,), datos):
+                libro.agregar("Países", pais)
+                if por_region:
+                    region = pais.get("Región", "N/A")
+                    if region not in libro.hojas:
+                        libro.agregar_hoja(region, campos)
+                    libro.agregar(region, pais)
+                for acumulador in acumuladores:
+                    acumulador.agregar(pais)
+        
+        for acumulador in acumuladores:
+            if (resumen := _resultado_estadisticas(acumulador)):
+                libro.agregar("Estadísticas", resumen)
+        
+        totales = libro.cerrar()
+        print(f"Datos exportados exitosamente a {nombre_archivo} ({len(totales)} hojas)")
+        return totales
+    
+    except Exception as e:
+        print(f"Error al exportar a Excel: {e}")
+        return None
+
+"""
+modulo.py - Exportación a CSV y Parquet, y elección del formato de exportación por extensión.
+"""
+# Extensión de archivo -> formato de exportación (las extensiones compuestas se comprueban primero)
+FORMATOS_EXPORTACION = {
+    ".csv.gz": "csv",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".xlsx": "excel",
+}
+
+def exportar_datos_csv(filas, nombre_archivo="datos_paises.csv", campos=None, compresion=None):
+    """
+    Exporta países a un archivo CSV (UTF-8) escribiendo las filas a medida que se recorren.
+    
+    Es el formato tabular más rápido de escribir y de cargar en otras herramientas. Con compresión
+    gzip el archivo ocupa varias veces menos y se escribe en la misma pasada.
+    
+    Args:
+        filas (iterable): Países estructurados (lista, TablaPaises o generador).
+        nombre_archivo (str): Nombre del archivo de salida. Por defecto: "datos_paises.csv".
+        campos (iterable): Columnas a exportar. Por defecto: las claves de la primera fila.
+        compresion (str): "gzip" para comprimir. Por defecto: gzip si el nombre termina en ".gz".
+    
+    Returns:
+        int: Cantidad de filas exportadas.
+        None: Si ocurre un error (el mensaje se imprime en consola).
+    
+    Ejemplo de uso:
+        exportar_datos_csv(datos_estructurados, "datos_paises.csv.gz")
+    """
+    try:
+        if compresion is None and nombre_archivo.lower().endswith(".gz"):
+            compresion = "gzip"
+        if compresion not in (None, "gzip"):
+            raise ValueError(f"Compresión no soportada para CSV: {compresion!r}. Use 'gzip'.")
+        
+        campos, filas = _campos_y_filas(filas, campos)
+        total = 0
+        with ArchivoAtomico(nombre_archivo, "wb") as f:
+            binario = gzip.GzipFile(fileobj=f.archivo, mode="wb") if compresion else f.archivo
+            # newline="" deja que el módulo csv controle los saltos de línea (\r\n, como Excel)
+            texto = io.TextIOWrapper(binario, encoding="utf-8", newline="")
+            escritor = csv.writer(texto)
+            escritor.writerow(campos)
+            for fila in filas:
+                escritor.writerow([fila.get(campo) for campo in campos])
+                total += 1
+            # Cerrar el envoltorio de texto y el compresor antes de confirmar, sin cerrar el archivo temporal
+            texto.flush()
+            texto.detach()
+            if compresion:
+                binario.close()
+        print(f"Datos exportados exitosamente a {nombre_archivo} ({total} filas)")
+        return total
+    
+    except Exception as e:
+        print(f"Error al exportar a CSV: {e}")
+        return None
+
+def exportar_datos_parquet(datos, nombre_archivo="datos_paises.parquet", campos=None):
+    """
+    Exporta países a un archivo Parquet con columnas tipadas.
+    
+    Usa el mismo esquema que TablaPaises: "Población" como entero de 64 bits, área y densidad como
+    reales de 64 bits, "Región" y "Subregión" codificadas por diccionario y el resto como texto.
+    Requiere el paquete opcional pyarrow.
+    
+    Args:
+        datos (list | TablaPaises): Países estructurados.
+        nombre_archivo (str): Nombre del archivo de salida. Por defecto: "datos_paises.parquet".
+        campos (iterable): Columnas a exportar. Por defecto: las claves de la primera fila.
+    
+    Returns:
+        int: Cantidad de filas exportadas.
+        None: Si ocurre un error (el mensaje se imprime en consola).
+    
+    Ejemplo de uso:
+        exportar_datos_parquet(datos_estructurados, "datos_paises.parquet")
+    """
+    try:
+        # Importación diferida: pyarrow es opcional y solo se necesita para Parquet
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        if isinstance(datos, TablaPaises):
+            tabla = datos
+        else:
+            campos, filas = _campos_y_filas(datos, campos)
+            tabla = TablaPaises.desde_filas(filas, campos)
+        
+        columnas = {}
+        for campo in campos or tabla.campos:
+            if campo in tabla._categorias:
+                codigos, categorias = tabla.codigos(campo)
+                columnas[campo] = pa.DictionaryArray.from_arrays(
+                    pa.array(codigos, type=pa.int32()), pa.array(categorias.tolist(), type=pa.string())
+                )
+            elif tabla._columnas[campo].dtype.kind in "biuf":
+                columnas[campo] = pa.array(tabla._columnas[campo])
+            else:
+                columnas[campo] = pa.array(tabla._columnas[campo].tolist(), type=pa.string())
+        
+        with ArchivoAtomico(nombre_archivo, "wb") as f:
+            pq.write_table(pa.table(columnas), f.archivo)
+        print(f"Datos exportados exitosamente a {nombre_archivo} ({len(tabla)} filas)")
+        return len(tabla)
+    
+    except Exception as e:
+        print(f"Error al exportar a Parquet: {e}")
+        return None
+
+def exportar_datos(datos, nombre_archivo, formato=None, campos=None):
+    """
+    Exporta países al formato indicado o, si no se indica, al que corresponde a la extensión del archivo.
+    
+    Todos los formatos comparten las columnas de estructurar_datos_paises:
+        - ".xlsx" -> Excel (exportar_datos_excel_streaming)
+        - ".csv" / ".csv.gz" -> CSV, opcionalmente comprimido (exportar_datos_csv)
+        - ".parquet" -> Parquet (exportar_datos_parquet)
+    
+    Args:
+        datos (iterable): Países estructurados (lista, TablaPaises o generador).
+        nombre_archivo (str): Nombre del archivo de salida.
+        formato (str): "excel", "csv" o "parquet". Por defecto: según la extensión.
+        campos (iterable): Columnas a exportar. Por defecto: todas.
+    
+    Returns:
+        int: Cantidad de filas exportadas.
+        None: Si el formato no se reconoce o la exportación falla (el motivo se informa en consola).
+    
+    Ejemplo de uso:
+        exportar_datos(datos_estructurados, "datos_paises.csv.gz")
+        exportar_datos(datos_estructurados, "salida.dat", formato="csv")
+    """
+    if formato is None:
+        formato = next((nombre for extension, nombre in FORMATOS_EXPORTACION.items()
+                        if nombre_archivo.lower().endswith(extension)), None)
+    if formato == "csv":
+        return exportar_datos_csv(datos, nombre_archivo, campos)
+    if formato == "parquet":
+        return exportar_datos_parquet(datos, nombre_archivo, campos)
+    if formato == "excel":
+        return exportar_datos_excel_streaming(datos, nombre_archivo, campos)
+    print(f"Formato de exportación no reconocido para {nombre_archivo}: use .xlsx, .csv, .csv.gz o .parquet.")
+    return None
+
 """
 modulo.py - Funciones para generar gráficos con matplotlib basados en datos estructurados.
 """
@@ -335,7 +3333,7 @@ def graficar_datos(datos, tipo_grafico="barras", titulo="Gráfico", eje_x="X", e
     Permite personalizar el tipo de gráfico, etiquetas y campos a representar.
     
     Args:
-        datos (list): Lista de diccionarios con datos de países (ej.: [{"Nombre": "Colombia", "Población": 50_882_891, ...}]). 
+        datos (list | TablaPaises): Lista de diccionarios con datos de países (ej.: [{"Nombre": "Colombia", "Población": 50_882_891, ...}]) o tabla columnar. 
         tipo_grafico (str): Tipo de gráfico ("barras" o "lineas").
         titulo (str): Título del gráfico (ej.: "Top 10 Países por Población").
         eje_x (str): Etiqueta del eje X (ej.: "País").
@@ -360,8 +3358,13 @@ def graficar_datos(datos, tipo_grafico="barras", titulo="Gráfico", eje_x="X", e
     try:
         # Extraer valores para los ejes X e Y desde los datos estructurados
         # Ejemplo: Si campo_x="Nombre", valores_x = ["Colombia", "Brasil", ...]
-        valores_x = [pais[campo_x] for pais in datos]
-        valores_y = [pais[campo_y] for pais in datos]
+        if isinstance(datos, TablaPaises):
+            # Tabla columnar: usar las columnas directamente
+            valores_x = datos.columna(campo_x)
+            valores_y = datos.columna(campo_y)
+        else:
+            valores_x = [pais[campo_x] for pais in datos]
+            valores_y = [pais[campo_y] for pais in datos]
         
         # Configurar estilo y tamaño del gráfico
         # Tamaño grande (12x6 pulgadas) para mejorar legibilidad
@@ -6,34 +6,74 @@ script.py - Programa principal que utiliza funciones del módulo PIA_Modulo para
     - Filtrar con expresiones regulares.
     - Analizar estadísticas y visualizar resultados.
     - Exportar datos a JSON/Excel.
+
+Uso:
+    python PIA_Script.py                        # Descarga los datos de la API
+    python PIA_Script.py --offline              # Usa la instantánea datos_paises.json sin conexión
+    python PIA_Script.py --snapshot otra.json   # Usa una instantánea concreta sin conexión
+    python PIA_Script.py --alias                # Busca también por traducciones y grafías alternativas
 """
 
+import argparse
+
 from PIA_Modulo import (
+    CAMPOS_API_ESTRUCTURA,
+    CAMPOS_API_BUSQUEDA,
     obtener_datos_paises,
     estructurar_datos_paises,
+    construir_tabla_alias,
     guardar_datos_json,
-    filtrar_paises_con_regex,
+    cargar_instantanea_paises,
+    buscar_paises_normalizado,
+    IndiceDifuso,
+    literales_patron,
     analizar_estadisticas,
-    exportar_datos_excel,
+    exportar_libro_excel,
     graficar_datos,
     interpretar_resultados
 )
 
+def leer_argumentos():
+    parser = argparse.ArgumentParser(description="Análisis de datos de países (API REST Countries).")
+    parser.add_argument("--offline", action="store_true",
+                        help="No consultar la API: cargar la instantánea datos_paises.json.")
+    parser.add_argument("--snapshot", metavar="ARCHIVO",
+                        help="Cargar países estructurados desde esta instantánea (implica --offline).")
+    parser.add_argument("--alias", action="store_true",
+                        help="Buscar también por nombres traducidos y grafías alternativas "
+                             "(descarga el campo translations de la API; no disponible sin conexión).")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    argumentos = leer_argumentos()
+    instantanea = argumentos.snapshot or ("datos_paises.json" if argumentos.offline else None)
+    
+    if instantanea:
+        # 1-3. Modo sin conexión: cargar países ya estructurados desde una instantánea guardada
+        # No hay datos crudos, así que la búsqueda no dispone de traducciones (solo nombres comunes)
+        datos_estructurados = cargar_instantanea_paises(instantanea)
+        alias = None
     # 1. Descargar datos originales desde la API REST Countries
     # Esta función es el punto de entrada para acceder a datos globales de países
-    if (datos_crudos := obtener_datos_paises()):
+    # Solo con --alias se piden también las traducciones (el campo más pesado de la respuesta)
+    elif (datos_crudos := obtener_datos_paises(
+            campos=CAMPOS_API_ESTRUCTURA + CAMPOS_API_BUSQUEDA if argumentos.alias else CAMPOS_API_ESTRUCTURA)):
         # 2. Transformar datos crudos en estructura tabular (lista de diccionarios)
         # Cada país tendrá campos normalizados como "Nombre", "Población", "Región", etc.
         datos_estructurados = estructurar_datos_paises(datos_crudos)
+        alias = construir_tabla_alias(datos_crudos) if argumentos.alias else None
         
-        # 3. Persistir datos en archivo JSON para análisis posterior
+        # 3. Persistir datos en archivo JSON para análisis posterior (y para ejecuciones con --offline)
         guardar_datos_json(datos_estructurados, "datos_paises.json")
-        
+    else:
+        datos_estructurados = None
+    
+    if datos_estructurados:
         # 4. Filtrar países usando expresiones regulares (ej.: "^A" o "land$")
-        # Esto permite búsquedas personalizadas sin modificar la API
+        # La búsqueda ignora tildes y mayúsculas ("Peru" = "Perú"); con --alias reconoce además
+        # nombres traducidos ("Alemania")
         patron = input("Ingrese un patrón de búsqueda (ej.: '^A' o 'land$'): ")
-        paises_filtrados = filtrar_paises_con_regex(datos_estructurados, patron)
+        paises_filtrados = buscar_paises_normalizado(datos_estructurados, patron, alias)
         
         # 5. Mostrar resultados filtrados en consola
         if paises_filtrados:
@@ -42,6 +82,11 @@ if __name__ == "__main__":
                 print(f"- {pais['Nombre']} (Región: {pais['Región']}, Idiomas: {pais['Idiomas']})")
         else:
             print(f"No se encontraron países que coincidan con el patrón '{patron}'.")
+            # Sugerir los nombres más parecidos por si el patrón tiene errores de escritura
+            # Se compara solo el texto literal del patrón: "^Argentna$" se busca como "Argentna"
+            indice = IndiceDifuso(alias) if alias else IndiceDifuso.desde_datos(datos_estructurados)
+            if (texto := literales_patron(patron)) and (sugerencias := indice.buscar(texto, k=3)):
+                print("¿Quiso decir: " + ", ".join(nombre for nombre, _ in sugerencias) + "?")
         
         # 6. Calcular estadísticas básicas (media, mediana, moda) sobre la población global
         print("\nAnálisis estadístico de población:")
@@ -51,9 +96,12 @@ if __name__ == "__main__":
                 print(f"{clave}: {valor}")
         
         # 7. Exportar datos a Excel para uso en herramientas de análisis
-        exportar_datos_excel(datos_estructurados, "datos_paises.xlsx")
-        if paises_filtrados:
-            exportar_datos_excel(paises_filtrados, "paises_filtrados.xlsx")
+        # Un solo libro: todos los países, los filtrados, el resumen estadístico y una hoja por región
+        exportar_libro_excel(
+            datos_estructurados,
+            "datos_paises.xlsx",
+            hojas_adicionales={"Filtrados": paises_filtrados} if paises_filtrados else None
+        )
         
         # 8. Visualizar datos con gráficos para mejorar comprensión de patrones
         print("\nVisualizando datos...")
@@ -94,4 +142,5 @@ if __name__ == "__main__":
                 interpretacion_area = interpretar_resultados(estadisticas_area, paises_filtrados, campo="Área (km²)")
                 print(interpretacion_area)
     else:
-        print("No se pudieron obtener datos de la API.")
\ No newline at end of file
+        print(f"No se pudieron cargar datos desde {instantanea}." if instantanea
+              else "No se pudieron obtener datos de la API.")
\ No newline at end of file
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures compartidas: los países estructurados de la instantánea datos_paises.json.
+"""
+import json
+import os
+
+import pytest
+
+from PIA_Modulo import TablaPaises
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datos_paises.json")
+
+
+@pytest.fixture(scope="session")
+def filas_paises():
+    """Lista de diccionarios con los países estructurados (no modificarla en los tests)."""
+    with open(RUTA_DATOS, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session")
+def tabla_paises(filas_paises):
+    """Los mismos países en formato columnar (TablaPaises)."""
+    return TablaPaises.desde_filas(filas_paises, campos=list(filas_paises[0]))
+
+
+class SesionFalsa:
+    """
+    Sustituye a la sesión HTTP compartida: cada get() entrega (o lanza) el siguiente elemento de
+    `respuestas` y registra sus argumentos en `solicitudes`.
+    """
+    def __init__(self):
+        self.respuestas = []
+        self.solicitudes = []
+        self.esperas = []
+    
+    def responder(self, codigo, cuerpo=None, cabeceras=None):
+        """Encola una requests.Response con el código, cuerpo JSON y cabeceras dados; anota si se cierra."""
+        import requests
+        
+        respuesta = requests.Response()
+        respuesta.status_code = codigo
+        respuesta._content = json.dumps(cuerpo).encode("utf-8") if cuerpo is not None else b""
+        respuesta.headers.update(cabeceras or {})
+        respuesta.url = "https://restcountries.test/v3.1/all"
+        respuesta.cerrada = False
+        respuesta.close = lambda: setattr(respuesta, "cerrada", True)
+        self.respuestas.append(respuesta)
+        return respuesta
+    
+    def fallar(self, excepcion):
+        self.respuestas.append(excepcion)
+    
+    def get(self, url, params=None, headers=None, timeout=None, stream=False):
+        self.solicitudes.append({"url": url, "params": params, "headers": dict(headers or {})})
+        siguiente = self.respuestas.pop(0)
+        if isinstance(siguiente, BaseException):
+            raise siguiente
+        return siguiente
+
+
+@pytest.fixture
+def sesion_falsa(monkeypatch):
+    """Sesión HTTP simulada, sin esperas reales entre reintentos y con el interruptor global cerrado."""
+    import PIA_Modulo
+    
+    sesion = SesionFalsa()
+    monkeypatch.setattr(PIA_Modulo, "_sesion_http", sesion)
+    monkeypatch.setattr(PIA_Modulo.time, "sleep", sesion.esperas.append)
+    PIA_Modulo.INTERRUPTOR_API.registrar_exito()
+    yield sesion
+    PIA_Modulo.INTERRUPTOR_API.registrar_exito()
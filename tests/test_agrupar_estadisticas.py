@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+agrupar_estadisticas: lista y TablaPaises dan el mismo resumen; la densidad agregada ignora territorios sin área.
+"""
+import pytest
+
+from PIA_Modulo import TablaPaises, agrupar_estadisticas
+
+
+def _pais(nombre, region, poblacion, area):
+    return {"Nombre": nombre, "Población": poblacion, "Área (km²)": area,
+            "Densidad (hab/km²)": round(poblacion / area, 2) if area > 0 else 0.0,
+            "Región": region, "Subregión": region, "Idiomas": "English", "Monedas": "USD (Dollar)"}
+
+
+FILAS = [
+    _pais("Continental", "Norte", 1_000, 100.0),
+    _pais("Costero", "Norte", 3_000, 100.0),
+    # Territorio sin área registrada: su población no debe entrar en la densidad agregada
+    _pais("Base antártica", "Norte", 50_000, 0.0),
+    _pais("Isla deshabitada", "Sur", 0, 40.0),
+]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_densidad_agregada_ignora_territorios_sin_area(columnar):
+    datos = TablaPaises.desde_filas(FILAS, campos=list(FILAS[0])) if columnar else FILAS
+    resumen = agrupar_estadisticas(datos, por="Región")
+    
+    assert resumen["Norte"]["Países"] == 3
+    assert resumen["Norte"]["Población"]["Suma"] == 54_000
+    assert resumen["Norte"]["Densidad Agregada (hab/km²)"] == 20.0
+    assert resumen["Sur"]["Densidad Agregada (hab/km²)"] == 0.0
+
+
+def test_lista_y_tabla_coinciden(filas_paises, tabla_paises):
+    lista, tabla = agrupar_estadisticas(filas_paises), agrupar_estadisticas(tabla_paises)
+    assert list(lista) == list(tabla)
+    for grupo in lista:
+        assert lista[grupo]["Países"] == tabla[grupo]["Países"]
+        assert lista[grupo]["Densidad Agregada (hab/km²)"] == tabla[grupo]["Densidad Agregada (hab/km²)"]
+        for campo in ("Población", "Área (km²)"):
+            assert (lista[grupo][campo] or {}).get("Suma") == (tabla[grupo][campo] or {}).get("Suma")
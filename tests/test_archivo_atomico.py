@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+ArchivoAtomico: archivo temporal + fsync + os.replace y bloqueo compartido por directorio.
+"""
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+
+import pytest
+
+import PIA_Modulo
+from PIA_Modulo import NOMBRE_ARCHIVO_BLOQUEO, ArchivoAtomico
+
+
+def _archivos(directorio):
+    return sorted(os.listdir(directorio))
+
+
+def test_escritura_correcta_reemplaza_el_destino(tmp_path):
+    destino = tmp_path / "datos.json"
+    destino.write_text("anterior", encoding="utf-8")
+    
+    with ArchivoAtomico(str(destino)) as f:
+        f.write("nuevo")
+    
+    assert destino.read_text(encoding="utf-8") == "nuevo"
+    assert _archivos(tmp_path) == sorted(["datos.json", NOMBRE_ARCHIVO_BLOQUEO])
+    assert PIA_Modulo._BLOQUEOS_PROCESO == {}
+
+
+def test_excepcion_dentro_del_bloque_conserva_el_original(tmp_path):
+    destino = tmp_path / "datos.json"
+    destino.write_text("original", encoding="utf-8")
+    
+    with pytest.raises(RuntimeError):
+        with ArchivoAtomico(str(destino)) as f:
+            f.write("a medio escribir")
+            raise RuntimeError("fallo simulado")
+    
+    assert destino.read_text(encoding="utf-8") == "original"
+    # Ni archivo temporal huérfano ni bloqueo retenido
+    assert _archivos(tmp_path) == sorted(["datos.json", NOMBRE_ARCHIVO_BLOQUEO])
+    assert PIA_Modulo._BLOQUEOS_PROCESO == {}
+
+
+@pytest.mark.skipif(os.name != "posix", reason="permisos POSIX")
+def test_conserva_los_permisos_del_destino(tmp_path):
+    destino = tmp_path / "datos.json"
+    destino.write_text("anterior", encoding="utf-8")
+    os.chmod(destino, 0o600)
+    
+    with ArchivoAtomico(str(destino)) as f:
+        f.write("nuevo")
+    
+    assert os.stat(destino).st_mode & 0o777 == 0o600
+
+
+def test_dos_archivos_del_mismo_directorio_no_se_bloquean(tmp_path):
+    # Con un bloqueo por archivo abierto, el segundo esperaría al primero (que nunca se libera)
+    with ArchivoAtomico(str(tmp_path / "a.json"), espera_bloqueo=1) as a:
+        with ArchivoAtomico(str(tmp_path / "b.json"), espera_bloqueo=1) as b:
+            a.write("a")
+            b.write("b")
+    
+    assert (tmp_path / "a.json").read_text(encoding="utf-8") == "a"
+    assert (tmp_path / "b.json").read_text(encoding="utf-8") == "b"
+    assert PIA_Modulo._BLOQUEOS_PROCESO == {}
+
+
+def test_dos_hilos_del_mismo_proceso_no_se_bloquean(tmp_path):
+    abierto = threading.Event()
+    errores = []
+    
+    def escribir_en_otro_hilo():
+        try:
+            abierto.wait(5)
+            with ArchivoAtomico(str(tmp_path / "b.json"), espera_bloqueo=1) as f:
+                f.write("b")
+        except Exception as e:
+            errores.append(e)
+    
+    hilo = threading.Thread(target=escribir_en_otro_hilo)
+    hilo.start()
+    with ArchivoAtomico(str(tmp_path / "a.json"), espera_bloqueo=1) as f:
+        abierto.set()
+        hilo.join(5)
+        f.write("a")
+    
+    assert not hilo.is_alive() and errores == []
+    assert PIA_Modulo._BLOQUEOS_PROCESO == {}
+
+
+@pytest.mark.skipif(PIA_Modulo.fcntl is None, reason="requiere fcntl")
+def test_otro_proceso_espera_el_bloqueo(tmp_path):
+    # Un proceso externo retiene el bloqueo del directorio hasta que se cierra su entrada estándar
+    codigo = textwrap.dedent(f"""
+        import fcntl, sys
+        with open({str(tmp_path / NOMBRE_ARCHIVO_BLOQUEO)!r}, "a+") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            print("bloqueado", flush=True)
+            sys.stdin.read()
+    """)
+    proceso = subprocess.Popen([sys.executable, "-c", codigo], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        assert proceso.stdout.readline().strip() == "bloqueado"
+        with pytest.raises(TimeoutError):
+            ArchivoAtomico(str(tmp_path / "datos.json"), espera_bloqueo=0.2)
+    finally:
+        proceso.communicate("", timeout=5)
+    
+    assert not (tmp_path / "datos.json").exists()
+    assert PIA_Modulo._BLOQUEOS_PROCESO == {}
+    # Liberado por el otro proceso, el bloqueo se obtiene sin esperar
+    with ArchivoAtomico(str(tmp_path / "datos.json"), espera_bloqueo=0.2) as f:
+        f.write("[]")
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+iterar_arreglo_json: mismo resultado que json.loads sin importar dónde se corten los fragmentos.
+"""
+import json
+
+import pytest
+
+from PIA_Modulo import iterar_arreglo_json
+
+DOCUMENTOS = [
+    "[]",
+    "  [ ]  ",
+    "\n\t[\r\n]\n",
+    "[1]",
+    " [ 1 , 2 ,3 ] ",
+    "[-12.5e+3, 0, 1E2, -0.0, 12345678901234567890, 4.5e-3]",
+    '["a\\"b", "c\\\\", "\\\\\\"", "\\\\", "\\/\\b\\f\\n\\r\\t"]',
+    '["\\ud83d\\ude00", "\\u00e9", "é😀", "\\u0041rgentina"]',
+    '[[1, [2, [3, []]]], {"a": {"b": [true, false, null]}}, {}, [], ""]',
+    '[true,false,null,"]",",","[","{"]',
+    '[{"name": {"common": "Perú", "official": "República del Perú"}, "population": 33715471,'
+    ' "area": 1285216.0, "latlng": [-10.0, -76.0], "translations": {"spa": {"common": "Perú"}}}]',
+]
+
+# Documentos que no son un arreglo JSON válido (incluye JSON válido que no es un arreglo y contenido sobrante)
+MALFORMADOS = [
+    "", "   ", "{}", "1", '"[1]"', "[", "[1", "[1,", "[1, 2", "[1 2]", "[1,]", "[,1]",
+    '["abc', '["abc\\', '["\\ud83d', "[{\"a\": 1]", "[tru", "[1, nul", "[1}", "[1] x", "[]]",
+]
+
+
+def _cortes(documento):
+    """Todas las formas de partir el documento en dos fragmentos, más carácter a carácter."""
+    for i in range(len(documento) + 1):
+        yield [documento[:i], documento[i:]]
+    yield list(documento)
+
+
+@pytest.mark.parametrize("documento", DOCUMENTOS)
+def test_coincide_con_json_loads_en_cualquier_corte(documento):
+    esperado = json.loads(documento)
+    for fragmentos in _cortes(documento):
+        assert list(iterar_arreglo_json(fragmentos)) == esperado, fragmentos
+
+
+def test_entrega_los_elementos_a_medida_que_llegan():
+    def fragmentos():
+        yield '[{"a": 1}, '
+        yield '{"b": 2'
+        raise AssertionError("se leyó más de lo necesario para el primer elemento")
+    
+    assert next(iterar_arreglo_json(fragmentos())) == {"a": 1}
+
+
+def test_paises_reales(filas_paises):
+    documento = json.dumps(filas_paises, ensure_ascii=False, indent=4)
+    fragmentos = [documento[i:i + 1000] for i in range(0, len(documento), 1000)]
+    assert list(iterar_arreglo_json(fragmentos)) == filas_paises
+
+
+@pytest.mark.parametrize("documento", MALFORMADOS)
+def test_documento_malformado_o_truncado_lanza_json_decode_error(documento):
+    for fragmentos in _cortes(documento):
+        with pytest.raises(json.JSONDecodeError):
+            list(iterar_arreglo_json(fragmentos))
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+solicitar_json_con_cache: caché en disco, revalidación con ETag/Last-Modified y copia vencida ante errores.
+"""
+import json
+
+import pytest
+import requests
+
+from PIA_Modulo import INTERRUPTOR_API, _ruta_cache, leer_cache, solicitar_json_con_cache
+
+URL = "https://restcountries.test/v3.1/all"
+PARAMETROS = {"fields": "name,population"}
+CUERPO = [{"name": {"common": "Perú"}, "population": 33715471}]
+ETAG = '"v1"'
+LAST_MODIFIED = "Tue, 01 Sep 2026 10:00:00 GMT"
+
+
+def _consultar(directorio, **opciones):
+    return solicitar_json_con_cache(URL, PARAMETROS, directorio_cache=str(directorio), reintentos=0, **opciones)
+
+
+def _cachear(sesion, directorio):
+    sesion.responder(200, CUERPO, {"ETag": ETAG, "Last-Modified": LAST_MODIFIED})
+    assert _consultar(directorio) == CUERPO
+
+
+def _vencer(directorio):
+    # Retrasa la marca de tiempo de la entrada para que la caché quede vencida
+    ruta = _ruta_cache(URL, PARAMETROS, str(directorio))
+    with open(ruta, encoding="utf-8") as f:
+        entrada = json.load(f)
+    entrada["guardado"] -= 10 ** 6
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(entrada, f)
+
+
+def test_la_clave_no_depende_del_orden_de_los_parametros(tmp_path):
+    assert _ruta_cache(URL, {"a": 1, "b": 2}, str(tmp_path)) == _ruta_cache(URL, {"b": 2, "a": 1}, str(tmp_path))
+    assert _ruta_cache(URL, {"a": 1}, str(tmp_path)) != _ruta_cache(URL, {"a": 2}, str(tmp_path))
+
+
+def test_fallo_de_cache_descarga_y_guarda_validadores(sesion_falsa, tmp_path):
+    _cachear(sesion_falsa, tmp_path)
+    
+    assert sesion_falsa.solicitudes[0]["headers"] == {}
+    assert sesion_falsa.solicitudes[0]["params"] == PARAMETROS
+    entrada = leer_cache(URL, PARAMETROS, str(tmp_path))
+    assert (entrada["cuerpo"], entrada["etag"], entrada["last_modified"]) == (CUERPO, ETAG, LAST_MODIFIED)
+
+
+def test_cache_vigente_no_consulta_la_red(sesion_falsa, tmp_path):
+    _cachear(sesion_falsa, tmp_path)
+    
+    assert _consultar(tmp_path) == CUERPO
+    assert len(sesion_falsa.solicitudes) == 1
+
+
+def test_cache_vencida_revalida_y_304_reutiliza_el_cuerpo(sesion_falsa, tmp_path):
+    _cachear(sesion_falsa, tmp_path)
+    _vencer(tmp_path)
+    sesion_falsa.responder(304, cabeceras={"ETag": '"v2"'})
+    
+    assert _consultar(tmp_path) == CUERPO
+    assert sesion_falsa.solicitudes[1]["headers"] == {"If-None-Match": ETAG, "If-Modified-Since": LAST_MODIFIED}
+    # El 304 renueva la entrada (vuelve a estar vigente) y actualiza el ETag
+    entrada = leer_cache(URL, PARAMETROS, str(tmp_path))
+    assert entrada["etag"] == '"v2"' and entrada["last_modified"] == LAST_MODIFIED
+    assert _consultar(tmp_path) == CUERPO
+    assert len(sesion_falsa.solicitudes) == 2
+
+
+def test_cache_vencida_con_datos_nuevos_reemplaza_la_entrada(sesion_falsa, tmp_path):
+    _cachear(sesion_falsa, tmp_path)
+    _vencer(tmp_path)
+    nuevo = [{"name": {"common": "Chile"}, "population": 19116209}]
+    sesion_falsa.responder(200, nuevo, {"ETag": '"v2"'})
+    
+    assert _consultar(tmp_path) == nuevo
+    entrada = leer_cache(URL, PARAMETROS, str(tmp_path))
+    assert (entrada["cuerpo"], entrada["etag"], entrada["last_modified"]) == (nuevo, '"v2"', None)
+
+
+@pytest.mark.parametrize("fallo", ["conexion", "http_404", "circuito_abierto"])
+def test_error_con_cache_vencida_devuelve_la_ultima_copia(sesion_falsa, tmp_path, capsys, fallo):
+    _cachear(sesion_falsa, tmp_path)
+    _vencer(tmp_path)
+    if fallo == "conexion":
+        sesion_falsa.fallar(requests.exceptions.ConnectionError("sin red"))
+    elif fallo == "http_404":
+        sesion_falsa.responder(404)
+    else:
+        INTERRUPTOR_API.abierto_desde = float("inf")
+    
+    assert _consultar(tmp_path) == CUERPO
+    assert "usando la última copia en caché" in capsys.readouterr().out
+
+
+def test_error_sin_cache_se_propaga(sesion_falsa, tmp_path):
+    sesion_falsa.fallar(requests.exceptions.ConnectionError("sin red"))
+    
+    with pytest.raises(requests.exceptions.ConnectionError):
+        _consultar(tmp_path)
+
+
+def test_sin_cache_no_lee_ni_escribe_en_disco(sesion_falsa, tmp_path):
+    _cachear(sesion_falsa, tmp_path)
+    otro = [{"name": {"common": "Chile"}}]
+    sesion_falsa.responder(200, otro, {"ETag": '"v2"'})
+    
+    assert _consultar(tmp_path, usar_cache=False) == otro
+    assert sesion_falsa.solicitudes[1]["headers"] == {}
+    assert leer_cache(URL, PARAMETROS, str(tmp_path))["cuerpo"] == CUERPO
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+AcumuladorEstadisticas frente al módulo statistics.
+
+Mediana y moda deben coincidir exactamente. Media y varianza se comparan con un error relativo
+máximo de 1e-12 (la tolerancia documentada en AcumuladorEstadisticas): Welford, los lotes de
+NumPy y combinar() suman en distinto orden y difieren en los últimos dígitos.
+"""
+import math
+import statistics
+
+import pytest
+
+from PIA_Modulo import TIPOS_COLUMNAS_NUMERICAS, AcumuladorEstadisticas, analizar_estadisticas
+
+TOLERANCIA_RELATIVA = 1e-12
+CAMPOS = list(TIPOS_COLUMNAS_NUMERICAS)
+
+
+def _valores(filas, campo):
+    return [pais[campo] for pais in filas if pais[campo] > 0]
+
+
+def _acumular_filas(campo, filas):
+    acumulador = AcumuladorEstadisticas(campo)
+    for pais in filas:
+        acumulador.agregar(pais)
+    return acumulador
+
+
+def _comparar(acumulador, valores):
+    assert acumulador.n == len(valores)
+    assert acumulador.mediana() == statistics.median(valores)
+    assert acumulador.moda() == statistics.mode(valores)
+    assert math.isclose(acumulador.suma, math.fsum(valores), rel_tol=TOLERANCIA_RELATIVA)
+    assert math.isclose(acumulador.media, statistics.mean(valores), rel_tol=TOLERANCIA_RELATIVA)
+    assert math.isclose(acumulador.varianza(), statistics.variance(valores), rel_tol=TOLERANCIA_RELATIVA)
+
+
+@pytest.mark.parametrize("campo", CAMPOS)
+def test_lista_coincide_con_statistics(filas_paises, campo):
+    _comparar(_acumular_filas(campo, filas_paises), _valores(filas_paises, campo))
+
+
+@pytest.mark.parametrize("campo", CAMPOS)
+def test_tabla_coincide_con_statistics(filas_paises, tabla_paises, campo):
+    acumulador = AcumuladorEstadisticas(campo)
+    acumulador.agregar_valores(tabla_paises.columna(campo))
+    _comparar(acumulador, _valores(filas_paises, campo))
+
+
+@pytest.mark.parametrize("campo", CAMPOS)
+@pytest.mark.parametrize("corte", [1, 50, 125, 249])
+def test_combinar_particiones_coincide_con_statistics(filas_paises, tabla_paises, campo, corte):
+    # Una partición fila a fila y la otra como lote vectorizado, en ambos órdenes
+    izquierda = _acumular_filas(campo, filas_paises[:corte])
+    derecha = AcumuladorEstadisticas(campo)
+    derecha.agregar_valores(tabla_paises.columna(campo)[corte:])
+    valores = _valores(filas_paises, campo)
+    
+    _comparar(AcumuladorEstadisticas(campo).combinar(izquierda).combinar(derecha), valores)
+    _comparar(derecha.combinar(izquierda), _valores(filas_paises[corte:] + filas_paises[:corte], campo))
+
+
+def test_combinar_con_acumulador_vacio_no_cambia_nada():
+    acumulador = AcumuladorEstadisticas("x")
+    for valor in (4, 8, 15):
+        acumulador.agregar_valor(valor)
+    antes = (acumulador.n, acumulador.media, acumulador.m2, acumulador.suma)
+    
+    acumulador.combinar(AcumuladorEstadisticas("x"))
+    assert (acumulador.n, acumulador.media, acumulador.m2, acumulador.suma) == antes
+
+
+def test_valores_pequenos_son_exactos():
+    valores = [3, 1, 1, 3, 7, 2]
+    acumulador = AcumuladorEstadisticas("x")
+    for valor in valores:
+        acumulador.agregar_valor(valor)
+    
+    # Empate de modas: la primera en aparecer, como statistics.mode
+    assert acumulador.moda() == statistics.mode(valores) == 3
+    assert acumulador.mediana() == statistics.median(valores)
+    assert acumulador.media == statistics.mean(valores)
+    assert acumulador.varianza() == statistics.variance(valores)
+
+
+def test_datos_insuficientes_lanzan_statistics_error():
+    acumulador = AcumuladorEstadisticas("x")
+    with pytest.raises(statistics.StatisticsError):
+        acumulador.mediana()
+    acumulador.agregar_valor(5)
+    with pytest.raises(statistics.StatisticsError):
+        acumulador.varianza()
+
+
+@pytest.mark.parametrize("campo", CAMPOS)
+def test_analizar_estadisticas_lista_y_tabla(filas_paises, tabla_paises, campo):
+    valores = _valores(filas_paises, campo)
+    for datos in (filas_paises, tabla_paises):
+        resultado = analizar_estadisticas(datos, campo)
+        assert resultado["Mediana"] == statistics.median(valores)
+        assert resultado["Moda"] == statistics.mode(valores)
+        # Los valores se redondean a 2 decimales: se admite además esa diferencia de redondeo
+        for clave, esperado in (("Media", statistics.mean(valores)), ("Varianza", statistics.variance(valores)),
+                                ("Desviación Estándar", statistics.stdev(valores))):
+            assert math.isclose(resultado[clave], esperado, rel_tol=TOLERANCIA_RELATIVA, abs_tol=0.005), clave
+
+
+@pytest.mark.parametrize("campo, mensaje", [("Campo inexistente", "no existe"), ("Nombre", "no es numérico")])
+def test_campo_invalido_devuelve_none_con_lista_y_tabla(filas_paises, tabla_paises, capsys, campo, mensaje):
+    for datos in (filas_paises, tabla_paises):
+        assert analizar_estadisticas(datos, campo) is None
+        assert mensaje in capsys.readouterr().out
+        # Con varios campos, solo el inválido queda en None
+        resultado = analizar_estadisticas(datos, [campo, "Población"])
+        assert list(resultado) == [campo, "Población"]
+        assert resultado[campo] is None and resultado["Población"]["Campo"] == "Población"
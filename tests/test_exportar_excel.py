@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+exportar_datos_excel: vista previa en consola y la misma tabla que exportar_datos_excel_streaming.
+"""
+import pytest
+
+from PIA_Modulo import exportar_datos_excel, exportar_datos_excel_streaming
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _leer(ruta):
+    hoja = openpyxl.load_workbook(ruta).active
+    return hoja.title, hoja["A1"].font.b, [list(fila) for fila in hoja.iter_rows(values_only=True)]
+
+
+@pytest.mark.parametrize("datos", ["lista", "tabla", "vacia"])
+def test_misma_tabla_que_la_exportacion_por_streaming(filas_paises, tabla_paises, tmp_path, capsys, datos):
+    datos = {"lista": filas_paises, "tabla": tabla_paises, "vacia": []}[datos]
+    exportar_datos_excel(datos, str(tmp_path / "a.xlsx"))
+    salida = capsys.readouterr().out
+    exportar_datos_excel_streaming(datos, str(tmp_path / "b.xlsx"))
+    
+    assert "Mostrando las primeras filas" in salida and "exportados exitosamente" in salida
+    titulo, negrita, filas = _leer(tmp_path / "a.xlsx")
+    assert (titulo, negrita, filas) == _leer(tmp_path / "b.xlsx")
+    assert titulo == "Sheet1" and negrita and len(filas) == len(datos) + 1
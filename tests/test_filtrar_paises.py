@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Validación de condiciones en filtrar_paises: los tipos incompatibles fallan con ValueError.
+"""
+import pytest
+
+from PIA_Modulo import _ordenar_condicion, filtrar_paises
+
+CONDICIONES_INVALIDAS = [
+    ("Población", "~", "1"),
+    ("Nombre", ">", 3),
+    ("Nombre", "entre", 5),
+    ("Población", "entre", (1, "x")),
+    ("Población", "entre", (1, 2, 3)),
+    ("Población", "==", "5"),
+    ("Región", "==", 3),
+    ("Población", ">", True),
+    ("Campo inexistente", "==", 1),
+    ("y", ("Región", "==", "Europe"), ("Nombre", "<", 10)),
+]
+
+
+@pytest.fixture(params=["lista", "tabla"])
+def datos(request):
+    return request.getfixturevalue("filas_paises" if request.param == "lista" else "tabla_paises")
+
+
+@pytest.mark.parametrize("condicion", CONDICIONES_INVALIDAS)
+def test_condicion_de_tipo_incompatible_lanza_value_error(datos, condicion):
+    with pytest.raises(ValueError):
+        filtrar_paises(datos, condicion)
+
+
+def test_condiciones_validas(datos):
+    condicion = ("y", ("Región", "==", "Europe"),
+                 ("o", ("Idiomas", "~", "German"), ("Área (km²)", "entre", (1_000, 50_000))))
+    assert filtrar_paises(datos, condicion)
+
+
+def test_orden_de_las_hijas_no_cambia_el_resultado(datos):
+    simples = (("Idiomas", "~", "Spanish"), ("Población", ">", 1_000_000), ("Región", "!=", "Europe"))
+    directa = filtrar_paises(datos, ("o", ("y", *simples), ("Nombre", "~", "^A")))
+    invertida = filtrar_paises(datos, ("o", ("Nombre", "~", "^A"), ("y", *reversed(simples))))
+    assert list(directa) == list(invertida)
+
+
+def test_ordenar_condicion_pone_las_regex_al_final():
+    condicion = ("y", ("Nombre", "~", "a"), ("o", ("Nombre", "~", "b"), ("Población", ">", 1)))
+    assert _ordenar_condicion(condicion) == (
+        "y", ("Nombre", "~", "a"), ("o", ("Población", ">", 1), ("Nombre", "~", "b")))
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Presupuesto de tiempo de importación de PIA_Modulo (medido con python -X importtime).
+"""
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tiempo acumulado máximo de "import PIA_Modulo" (microsegundos). Hoy ronda los 30 ms; con las
+# dependencias pesadas importadas al cargar el módulo superaba los 700 ms.
+PRESUPUESTO_IMPORTACION_US = 150_000
+# Se toma el mejor de varios intentos para no depender del ruido de la máquina
+INTENTOS = 3
+
+DEPENDENCIAS_DIFERIDAS = ("numpy", "pandas", "matplotlib", "requests")
+
+
+def _ejecutar(*argumentos):
+    return subprocess.run([sys.executable, *argumentos], cwd=RAIZ, capture_output=True, text=True, check=True)
+
+
+def _tiempo_acumulado_us():
+    # Formato de cada línea: "import time: <propio> | <acumulado> | <módulo>"
+    for linea in _ejecutar("-X", "importtime", "-c", "import PIA_Modulo").stderr.splitlines():
+        campos = linea.split("|")
+        if len(campos) == 3 and campos[2].strip() == "PIA_Modulo":
+            return int(campos[1])
+    raise AssertionError("python -X importtime no informó la importación de PIA_Modulo")
+
+
+def test_importacion_dentro_del_presupuesto():
+    mejor = min(_tiempo_acumulado_us() for _ in range(INTENTOS))
+    assert mejor <= PRESUPUESTO_IMPORTACION_US, (
+        f"import PIA_Modulo tardó {mejor / 1000:.1f} ms (presupuesto: {PRESUPUESTO_IMPORTACION_US / 1000:.0f} ms)"
+    )
+
+
+def test_importacion_no_carga_dependencias_pesadas():
+    codigo = (
+        "import sys, PIA_Modulo; "
+        f"print(' '.join(m for m in {DEPENDENCIAS_DIFERIDAS!r} if m in sys.modules))"
+    )
+    assert _ejecutar("-c", codigo).stdout.split() == []
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+IndiceDifuso y literales_patron: sugerencias a partir del patrón que escribe el usuario.
+"""
+import pytest
+
+from PIA_Modulo import IndiceDifuso, literales_patron
+
+
+@pytest.mark.parametrize("patron, esperado", [
+    ("^Argentna$", "Argentna"),
+    ("land$", "land"),
+    ("^Unted Stat.*", "Unted Stat"),
+    ("^Peru\\b", "Peru"),
+    ("St\\. Lucia", "St. Lucia"),
+    ("^[A-C]uba$", "uba"),
+    ("Côte", "Côte"),
+    ("^.*$", ""),
+])
+def test_literales_patron(patron, esperado):
+    assert literales_patron(patron) == esperado
+
+
+@pytest.mark.parametrize("patron, pais", [
+    ("^Argentna$", "Argentina"),
+    ("^Germny", "Germany"),
+    ("Swtzerland$", "Switzerland"),
+    ("^Peru\\b", "Peru"),
+])
+def test_sugerencias_ignoran_la_sintaxis_regex(filas_paises, patron, pais):
+    indice = IndiceDifuso.desde_datos(filas_paises)
+    sugerencias = indice.buscar(literales_patron(patron), k=3)
+    # Con el patrón crudo, anclas y metacaracteres suman distancia (o no se sugiere nada)
+    assert sugerencias[0][0] == pais
+    assert sugerencias[0][1] < dict(indice.buscar(patron, k=3)).get(pais, float("inf"))
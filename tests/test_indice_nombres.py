@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Paridad entre IndiceNombres.filtrar y filtrar_paises_con_regex sobre datos_paises.json.
+"""
+import pytest
+
+from PIA_Modulo import IndiceNombres, filtrar_paises_con_regex
+
+PATRONES = [
+    "^A", "land$", "ana", "^United", "stan$", "^A.*a$", "Guinea", "^S[a-z]+a$",
+    "an{1,100}", "an{2}", "ina{1,2}x{0}", "a{,3}n", "ia?n", "an*d", "an+d",
+    "\\x20Islands", "\\x41rgentina", "\\u0041rgentina", "\\101rgentina",
+    "\\N{LATIN CAPITAL LETTER A}rgentina", "(a)\\1", "Isl\\wnds", "\\.", "\\bSouth\\b",
+    "^(North|South)", "ea|ia$", "(?i)^a", "^[^A-M]", "^.{4}$", "a{b", "^Ar(gen)?tina$",
+]
+
+
+@pytest.fixture(scope="module")
+def indice(filas_paises):
+    return IndiceNombres(filas_paises)
+
+
+@pytest.mark.parametrize("patron", PATRONES)
+def test_filtrar_coincide_con_filtrar_paises_con_regex(filas_paises, indice, patron):
+    esperado = [pais["Nombre"] for pais in filtrar_paises_con_regex(filas_paises, patron)]
+    obtenido = [pais["Nombre"] for pais in indice.filtrar(patron)]
+    assert obtenido == esperado
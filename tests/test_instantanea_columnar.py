@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+guardar_instantanea_columnar / cargar_instantanea_columnar: ida y vuelta exacta, con y sin mapeo en memoria.
+"""
+import numpy as np
+import pytest
+
+from PIA_Modulo import (
+    COLUMNAS_CATEGORICAS,
+    TIPOS_COLUMNAS_NUMERICAS,
+    TablaPaises,
+    cargar_instantanea_columnar,
+    guardar_instantanea_columnar,
+)
+
+FILAS_NO_ASCII = [
+    {"Nombre": "Côte d'Ivoire", "Población": 26378275, "Región": "Africa", "Subregión": "Western Africa",
+     "Idiomas": "French", "Área (km²)": 322463.0, "Densidad (hab/km²)": 81.8},
+    {"Nombre": "São Tomé and Príncipe", "Población": 219161, "Región": "Africa", "Subregión": "Middle Africa",
+     "Idiomas": "Portuguese", "Área (km²)": 964.0, "Densidad (hab/km²)": 227.35},
+    {"Nombre": "日本 🗾", "Población": 125836021, "Región": "Asia", "Subregión": "Eastern Asia",
+     "Idiomas": "", "Área (km²)": 377930.0, "Densidad (hab/km²)": 332.96},
+    {"Nombre": "Åland Islands", "Población": 0, "Región": "Europe", "Subregión": "Northern Europe",
+     "Idiomas": "Swedish", "Área (km²)": 0.0, "Densidad (hab/km²)": 0.0},
+]
+
+
+def _ida_y_vuelta(tmp_path, datos, mapear):
+    ruta = str(tmp_path / "paises.npz")
+    guardar_instantanea_columnar(datos, ruta)
+    return cargar_instantanea_columnar(ruta, mapear=mapear)
+
+
+def _comparar(tabla, original):
+    assert tabla.campos == original.campos
+    assert tabla.a_filas() == original.a_filas()
+    for campo in original.campos:
+        assert tabla.columna(campo).dtype == original.columna(campo).dtype, campo
+
+
+@pytest.mark.parametrize("mapear", [True, False])
+def test_ida_y_vuelta_con_los_datos_de_la_api(tmp_path, tabla_paises, mapear):
+    tabla = _ida_y_vuelta(tmp_path, tabla_paises, mapear)
+    _comparar(tabla, tabla_paises)
+    for campo in TIPOS_COLUMNAS_NUMERICAS:
+        assert isinstance(tabla._columnas[campo], np.memmap) == mapear
+
+
+@pytest.mark.parametrize("mapear", [True, False])
+def test_columnas_categoricas_conservan_codigos_y_diccionario(tmp_path, tabla_paises, mapear):
+    tabla = _ida_y_vuelta(tmp_path, tabla_paises, mapear)
+    for campo in COLUMNAS_CATEGORICAS:
+        codigos, categorias = tabla.codigos(campo)
+        codigos_originales, categorias_originales = tabla_paises.codigos(campo)
+        assert np.array_equal(codigos, codigos_originales) and codigos.dtype == codigos_originales.dtype
+        assert categorias.tolist() == categorias_originales.tolist()
+
+
+@pytest.mark.parametrize("mapear", [True, False])
+def test_texto_no_ascii(tmp_path, mapear):
+    original = TablaPaises.desde_filas(FILAS_NO_ASCII, campos=list(FILAS_NO_ASCII[0]))
+    _comparar(_ida_y_vuelta(tmp_path, FILAS_NO_ASCII, mapear), original)
+
+
+@pytest.mark.parametrize("mapear", [True, False])
+def test_tabla_vacia(tmp_path, mapear):
+    tabla = _ida_y_vuelta(tmp_path, [], mapear)
+    assert len(tabla) == 0
+    _comparar(tabla, TablaPaises.desde_filas([]))
+
+
+def test_npz_comprimido_se_rechaza_al_mapear(tmp_path, tabla_paises, capsys):
+    # Mismo contenido que una instantánea válida, pero con los miembros comprimidos
+    ruta = str(tmp_path / "paises.npz")
+    guardar_instantanea_columnar(tabla_paises, ruta)
+    with np.load(ruta) as contenido:
+        arreglos = {clave: contenido[clave] for clave in contenido.files}
+    comprimido = str(tmp_path / "comprimido.npz")
+    np.savez_compressed(comprimido, **arreglos)
+    capsys.readouterr()
+    
+    assert cargar_instantanea_columnar(comprimido, mapear=True) is None
+    assert "comprimido" in capsys.readouterr().out
+    # Sin mapeo en memoria, np.load lo descomprime y se obtiene la tabla original
+    _comparar(cargar_instantanea_columnar(comprimido, mapear=False), tabla_paises)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+guardar_datos_json / cargar_datos_json: variantes legible, compacta, gzip y zstd, y archivos dañados.
+"""
+import pytest
+
+from PIA_Modulo import cargar_datos_json, guardar_datos_json
+
+
+@pytest.mark.parametrize("nombre, compacto", [("paises.json", False), ("paises.json", True),
+                                              ("paises.json.gz", False), ("paises.json.gz", True)])
+def test_ida_y_vuelta(filas_paises, tmp_path, nombre, compacto):
+    ruta = str(tmp_path / nombre)
+    guardar_datos_json(filas_paises, ruta, compacto=compacto)
+    assert cargar_datos_json(ruta) == filas_paises
+
+
+def _danar(ruta, danar):
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    with open(ruta, "wb") as f:
+        f.write(danar(contenido))
+
+
+@pytest.mark.parametrize("danar", [
+    lambda contenido: contenido[:len(contenido) // 2],                                   # truncado
+    lambda contenido: contenido[:-8] + bytes(4) + contenido[-4:],                        # CRC incorrecto
+    lambda contenido: contenido[:20] + bytes(40) + contenido[60:],                       # datos alterados
+], ids=["truncado", "crc", "alterado"])
+def test_gzip_danado_se_informa_y_devuelve_none(filas_paises, tmp_path, capsys, danar):
+    ruta = str(tmp_path / "paises.json.gz")
+    guardar_datos_json(filas_paises, ruta)
+    _danar(ruta, danar)
+    
+    assert cargar_datos_json(ruta) is None
+    assert "Error al cargar el archivo" in capsys.readouterr().out
+
+
+def test_zstd(filas_paises, tmp_path, capsys):
+    pytest.importorskip("zstandard")
+    ruta = str(tmp_path / "paises.json.zst")
+    guardar_datos_json(filas_paises, ruta, compacto=True)
+    assert cargar_datos_json(ruta) == filas_paises
+    
+    # Cabecera de trama zstd válida seguida de datos sin sentido: ZstdError se informa como los demás errores
+    _danar(ruta, lambda contenido: contenido[:6] + bytes(len(contenido) - 6))
+    capsys.readouterr()
+    assert cargar_datos_json(ruta) is None
+    assert "Error al cargar el archivo" in capsys.readouterr().out
+
+
+def test_json_invalido(tmp_path, capsys):
+    ruta = tmp_path / "paises.json"
+    ruta.write_text('[{"Nombre": ', encoding="utf-8")
+    assert cargar_datos_json(str(ruta)) is None
+    assert "Error al cargar el archivo" in capsys.readouterr().out
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+ejecutar_pipeline: si la pasada falla, los sumideros se descartan sin dejar archivos a medias.
+"""
+import gc
+import os
+import tempfile
+
+import pytest
+
+from PIA_Modulo import NOMBRE_ARCHIVO_BLOQUEO, SumideroExcel, SumideroJSON, ejecutar_pipeline
+
+
+def _filas_que_fallan(filas, fallar_en):
+    for i, fila in enumerate(filas):
+        if i == fallar_en:
+            raise RuntimeError("fallo simulado en la fila %d" % i)
+        yield fila
+
+
+class SumideroQueFalla:
+    """Sumidero que lanza una excepción al recibir la fila indicada."""
+    def __init__(self, fallar_en):
+        self.fallar_en = fallar_en
+        self.total = 0
+    
+    def agregar(self, fila):
+        if self.total == self.fallar_en:
+            raise RuntimeError("sumidero roto")
+        self.total += 1
+    
+    def cerrar(self):
+        return self.total
+
+
+@pytest.fixture
+def directorio_temporal(tmp_path, monkeypatch):
+    # openpyxl crea los temporales de sus hojas con tempfile.mkstemp
+    directorio = tmp_path / "temporales"
+    directorio.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(directorio))
+    return directorio
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_fallo_con_sumidero_excel_no_deja_archivos(filas_paises, tmp_path, directorio_temporal):
+    salida = tmp_path / "salida"
+    salida.mkdir()
+    destino = salida / "paises.xlsx"
+    
+    with pytest.raises(RuntimeError):
+        ejecutar_pipeline(_filas_que_fallan(filas_paises, 10), {"excel": SumideroExcel(str(destino))})
+    gc.collect()
+    
+    assert os.listdir(salida) == []
+    assert os.listdir(directorio_temporal) == []
+
+
+@pytest.mark.parametrize("fallo", ["filas", "sumidero"])
+def test_fallo_no_reemplaza_salidas_anteriores(filas_paises, tmp_path, directorio_temporal, fallo):
+    json_destino, excel_destino = tmp_path / "paises.json", tmp_path / "paises.xlsx"
+    ejecutar_pipeline(iter(filas_paises), {"json": SumideroJSON(str(json_destino)),
+                                           "excel": SumideroExcel(str(excel_destino))})
+    contenido_json, contenido_excel = json_destino.read_bytes(), excel_destino.read_bytes()
+    
+    sumideros = {"json": SumideroJSON(str(json_destino)), "excel": SumideroExcel(str(excel_destino))}
+    if fallo == "filas":
+        filas = _filas_que_fallan(filas_paises, 10)
+    else:
+        filas, sumideros["roto"] = iter(filas_paises), SumideroQueFalla(10)
+    with pytest.raises(RuntimeError):
+        ejecutar_pipeline(filas, sumideros)
+    
+    assert json_destino.read_bytes() == contenido_json
+    assert excel_destino.read_bytes() == contenido_excel
+    assert sorted(os.listdir(tmp_path)) == sorted(["paises.json", "paises.xlsx", NOMBRE_ARCHIVO_BLOQUEO,
+                                                   directorio_temporal.name])
+    assert os.listdir(directorio_temporal) == []
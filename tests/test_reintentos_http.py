@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+solicitar_con_reintentos e InterruptorCircuito: reintentos con jitter, Retry-After y estado semiabierto.
+"""
+import threading
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+import PIA_Modulo
+from PIA_Modulo import InterruptorCircuito, _segundos_retry_after, solicitar_con_reintentos
+
+URL = "https://restcountries.test/v3.1/all"
+
+
+def _solicitar(interruptor=None, **opciones):
+    return solicitar_con_reintentos(URL, interruptor=interruptor or InterruptorCircuito(), **opciones)
+
+
+def _abrir(interruptor):
+    for _ in range(interruptor.umbral_fallos):
+        interruptor.registrar_fallo()
+
+
+def _cumplir_recuperacion(interruptor):
+    # Simula que pasó el tiempo de recuperación (la fixture sesion_falsa anula time.sleep)
+    interruptor.abierto_desde -= interruptor.tiempo_recuperacion
+
+
+# --- Retry-After ---
+
+def test_retry_after_en_segundos():
+    assert _segundos_retry_after("120") == 120.0
+    assert _segundos_retry_after("1.5") == 1.5
+    assert _segundos_retry_after("-3") == 0.0
+
+
+def test_retry_after_como_fecha_http():
+    futura = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    pasada = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert 28 <= _segundos_retry_after(futura) <= 30
+    assert _segundos_retry_after(pasada) == 0.0
+
+
+@pytest.mark.parametrize("valor", [None, "", "pronto", "Mon, 99 Foo 2026"])
+def test_retry_after_ausente_o_invalido(valor):
+    assert _segundos_retry_after(valor) is None
+
+
+# --- Reintentos ---
+
+def test_reintenta_codigos_transitorios_y_cierra_las_respuestas(sesion_falsa):
+    descartadas = [sesion_falsa.responder(503), sesion_falsa.responder(429)]
+    final = sesion_falsa.responder(200, [])
+    
+    assert _solicitar() is final
+    assert len(sesion_falsa.solicitudes) == 3 and len(sesion_falsa.esperas) == 2
+    assert all(respuesta.cerrada for respuesta in descartadas) and not final.cerrada
+
+
+def test_codigo_no_reintentable_se_devuelve_sin_reintentar(sesion_falsa):
+    final = sesion_falsa.responder(404)
+    interruptor = InterruptorCircuito(umbral_fallos=1)
+    
+    assert _solicitar(interruptor) is final
+    assert sesion_falsa.esperas == [] and interruptor.fallos == 0
+
+
+def test_reintentos_agotados_lanzan_http_error_y_cuentan_un_fallo(sesion_falsa):
+    respuestas = [sesion_falsa.responder(500) for _ in range(3)]
+    interruptor = InterruptorCircuito()
+    
+    with pytest.raises(requests.exceptions.HTTPError):
+        _solicitar(interruptor, reintentos=2)
+    assert all(respuesta.cerrada for respuesta in respuestas)
+    assert len(sesion_falsa.esperas) == 2 and interruptor.fallos == 1
+
+
+@pytest.mark.parametrize("excepcion", [requests.exceptions.Timeout, requests.exceptions.ConnectionError])
+def test_errores_de_red_se_reintentan(sesion_falsa, excepcion):
+    sesion_falsa.fallar(excepcion("transitorio"))
+    final = sesion_falsa.responder(200, [])
+    
+    assert _solicitar() is final
+    
+    sesion_falsa.fallar(excepcion("persistente"))
+    with pytest.raises(excepcion):
+        _solicitar(reintentos=0)
+
+
+def test_espera_con_jitter_dentro_de_los_limites(sesion_falsa):
+    factor, maxima, reintentos = 0.5, 3.0, 5
+    for _ in range(50):
+        sesion_falsa.esperas.clear()
+        for _ in range(reintentos + 1):
+            sesion_falsa.responder(503)
+        with pytest.raises(requests.exceptions.HTTPError):
+            _solicitar(reintentos=reintentos, factor_espera=factor, espera_maxima=maxima)
+        # Una espera por reintento: entre 0 y factor * 2^intento, sin superar espera_maxima
+        assert len(sesion_falsa.esperas) == reintentos
+        for intento, espera in enumerate(sesion_falsa.esperas):
+            assert 0 <= espera <= min(maxima, factor * 2 ** intento)
+
+
+def test_retry_after_tiene_prioridad_y_se_limita(sesion_falsa):
+    sesion_falsa.responder(429, cabeceras={"Retry-After": "7"})
+    sesion_falsa.responder(503, cabeceras={"Retry-After": "3600"})
+    sesion_falsa.responder(200, [])
+    
+    _solicitar(espera_maxima=30)
+    assert sesion_falsa.esperas == [7.0, 30]
+
+
+# --- Interruptor de circuito ---
+
+def test_circuito_se_abre_al_alcanzar_el_umbral(sesion_falsa):
+    interruptor = InterruptorCircuito(umbral_fallos=2, tiempo_recuperacion=60)
+    interruptor.registrar_fallo()
+    assert interruptor.permitir()
+    interruptor.registrar_fallo()
+    
+    with pytest.raises(PIA_Modulo.CircuitoAbiertoError):
+        _solicitar(interruptor)
+    assert sesion_falsa.solicitudes == []
+
+
+def test_exito_reinicia_el_contador():
+    interruptor = InterruptorCircuito(umbral_fallos=2)
+    interruptor.registrar_fallo()
+    interruptor.registrar_exito()
+    interruptor.registrar_fallo()
+    assert interruptor.permitir() and interruptor.abierto_desde is None
+
+
+def test_semiabierto_admite_una_sola_prueba():
+    interruptor = InterruptorCircuito(umbral_fallos=1, tiempo_recuperacion=0)
+    _abrir(interruptor)
+    
+    assert interruptor.permitir()
+    assert not interruptor.permitir()
+    interruptor.registrar_exito()
+    assert interruptor.permitir() and interruptor.permitir()
+
+
+def test_semiabierto_con_hilos_concurrentes_admite_una_sola_prueba():
+    interruptor = InterruptorCircuito(umbral_fallos=1, tiempo_recuperacion=0)
+    _abrir(interruptor)
+    barrera = threading.Barrier(10)
+    admitidos = []
+    
+    def intentar():
+        barrera.wait()
+        admitidos.append(interruptor.permitir())
+    
+    hilos = [threading.Thread(target=intentar) for _ in range(10)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert admitidos.count(True) == 1
+
+
+def test_prueba_fallida_reabre_el_circuito(sesion_falsa):
+    interruptor = InterruptorCircuito(umbral_fallos=3, tiempo_recuperacion=60)
+    _abrir(interruptor)
+    _cumplir_recuperacion(interruptor)
+    sesion_falsa.fallar(requests.exceptions.ConnectionError("sigue caída"))
+    
+    with pytest.raises(requests.exceptions.ConnectionError):
+        _solicitar(interruptor, reintentos=0)
+    # Reabierto: se vuelve a esperar todo el tiempo de recuperación
+    assert not interruptor.permitir()
+    _cumplir_recuperacion(interruptor)
+    assert interruptor.permitir()
+
+
+def test_prueba_exitosa_cierra_el_circuito(sesion_falsa):
+    interruptor = InterruptorCircuito(umbral_fallos=1, tiempo_recuperacion=0)
+    _abrir(interruptor)
+    sesion_falsa.responder(200, [])
+    
+    _solicitar(interruptor)
+    assert interruptor.abierto_desde is None and interruptor.fallos == 0 and not interruptor.sonda_en_curso
+
+
+@pytest.mark.parametrize("excepcion", [requests.exceptions.InvalidURL("URL inválida"), KeyboardInterrupt()])
+def test_salida_inesperada_libera_la_prueba_sin_cerrar_el_circuito(sesion_falsa, excepcion):
+    # Sin cancelar_sonda, la prueba quedaría "en curso" para siempre y el circuito nunca volvería a probar
+    interruptor = InterruptorCircuito(umbral_fallos=1, tiempo_recuperacion=0)
+    _abrir(interruptor)
+    sesion_falsa.fallar(excepcion)
+    
+    with pytest.raises(type(excepcion)):
+        _solicitar(interruptor)
+    assert not interruptor.sonda_en_curso and interruptor.abierto_desde is not None
+    assert interruptor.permitir()
+
+
+def test_cancelar_sonda_no_altera_el_contador():
+    interruptor = InterruptorCircuito(umbral_fallos=1, tiempo_recuperacion=0)
+    _abrir(interruptor)
+    assert interruptor.permitir()
+    
+    interruptor.cancelar_sonda()
+    assert interruptor.fallos == 1 and interruptor.abierto_desde is not None
+    assert interruptor.permitir() and not interruptor.permitir()